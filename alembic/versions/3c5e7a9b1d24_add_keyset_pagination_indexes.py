@@ -0,0 +1,30 @@
+"""add keyset pagination indexes
+
+Revision ID: 3c5e7a9b1d24
+Revises: 10fd2dbe926f
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e7a9b1d24'
+down_revision: Union[str, None] = '10fd2dbe926f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor pagination orders by (sort key, id); these indexes let the
+    # database seek straight to the last seen key for any page depth.
+    op.create_index('ix_employees_name_id', 'employees', ['name', 'id'], unique=False)
+    op.create_index('ix_employees_hire_date_id', 'employees', ['hire_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_employees_hire_date_id', table_name='employees')
+    op.drop_index('ix_employees_name_id', table_name='employees')
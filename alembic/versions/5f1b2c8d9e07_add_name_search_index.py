@@ -0,0 +1,45 @@
+"""add name search index
+
+Revision ID: 5f1b2c8d9e07
+Revises: 3c5e7a9b1d24
+Create Date: 2026-10-18 10:04:17.552930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.name_search_service import create_sqlite_name_index, drop_sqlite_name_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1b2c8d9e07'
+down_revision: Union[str, None] = '3c5e7a9b1d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        # Build without blocking writes on large tables
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_employees_name_trgm', 'employees', ['name'], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={'name': 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+    elif bind.dialect.name == 'sqlite':
+        create_sqlite_name_index(bind)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_employees_name_trgm', table_name='employees', postgresql_concurrently=True)
+    elif bind.dialect.name == 'sqlite':
+        drop_sqlite_name_index(bind)
@@ -0,0 +1,48 @@
+"""add search filter indexes
+
+Revision ID: 7a2d4e6f8b13
+Revises: 5f1b2c8d9e07
+Create Date: 2026-10-18 11:26:53.084417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4e6f8b13'
+down_revision: Union[str, None] = '5f1b2c8d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, partial-index predicate)
+SEARCH_INDEXES = [
+    ('ix_employees_org_status_department', ['organization_id', 'status', 'department'], None),
+    ('ix_employees_org_department_position', ['organization_id', 'department', 'position'], None),
+    ('ix_employees_org_location_department', ['organization_id', 'location', 'department'], None),
+    ('ix_employees_org_position', ['organization_id', 'position'], None),
+    ('ix_employees_active_org_department', ['organization_id', 'department'], "status = 'ACTIVE'"),
+]
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, columns, where in SEARCH_INDEXES:
+            predicate = sa.text(where) if where else None
+            op.create_index(
+                name, 'employees', columns, unique=False,
+                postgresql_where=predicate,
+                sqlite_where=predicate,
+                postgresql_concurrently=is_postgresql,
+            )
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(SEARCH_INDEXES):
+            op.drop_index(name, table_name='employees', postgresql_concurrently=is_postgresql)
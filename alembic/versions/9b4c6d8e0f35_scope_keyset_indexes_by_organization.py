@@ -0,0 +1,42 @@
+"""scope keyset indexes by organization
+
+Revision ID: 9b4c6d8e0f35
+Revises: 7a2d4e6f8b13
+Create Date: 2026-10-18 12:41:08.916272
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4c6d8e0f35'
+down_revision: Union[str, None] = '7a2d4e6f8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Searches are now organization-scoped, so cursor pages seek on
+    # (organization_id, sort key, id) instead of (sort key, id).
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        op.create_index('ix_employees_org_name_id', 'employees', ['organization_id', 'name', 'id'],
+                        unique=False, postgresql_concurrently=is_postgresql)
+        op.create_index('ix_employees_org_hire_date_id', 'employees', ['organization_id', 'hire_date', 'id'],
+                        unique=False, postgresql_concurrently=is_postgresql)
+        op.drop_index('ix_employees_name_id', table_name='employees', postgresql_concurrently=is_postgresql)
+        op.drop_index('ix_employees_hire_date_id', table_name='employees', postgresql_concurrently=is_postgresql)
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        op.create_index('ix_employees_name_id', 'employees', ['name', 'id'],
+                        unique=False, postgresql_concurrently=is_postgresql)
+        op.create_index('ix_employees_hire_date_id', 'employees', ['hire_date', 'id'],
+                        unique=False, postgresql_concurrently=is_postgresql)
+        op.drop_index('ix_employees_org_name_id', table_name='employees', postgresql_concurrently=is_postgresql)
+        op.drop_index('ix_employees_org_hire_date_id', table_name='employees', postgresql_concurrently=is_postgresql)
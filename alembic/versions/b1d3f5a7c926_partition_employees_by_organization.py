@@ -0,0 +1,120 @@
+"""partition employees by organization
+
+Optional storage mode, controlled by environment variables read at upgrade time:
+
+    EMPLOYEES_PARTITION_STRATEGY   ""/"none" (default, no-op), "hash" or "list"
+    EMPLOYEES_HASH_PARTITIONS      number of HASH partitions (default 16)
+
+"hash" spreads tenants over a fixed number of partitions. "list" creates one
+partition per existing organization plus a DEFAULT partition for organizations
+created later (see app.services.tenant_partition_service). Only PostgreSQL is
+supported; other databases are left untouched.
+
+Revision ID: b1d3f5a7c926
+Revises: 9b4c6d8e0f35
+Create Date: 2026-10-18 13:22:45.207391
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d3f5a7c926'
+down_revision: Union[str, None] = '9b4c6d8e0f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITION_STRATEGY = (os.getenv('EMPLOYEES_PARTITION_STRATEGY') or 'none').lower()
+HASH_PARTITIONS = int(os.getenv('EMPLOYEES_HASH_PARTITIONS', 16))
+
+# Secondary indexes of employees at this revision: (name, columns, extra kwargs)
+EMPLOYEE_INDEXES = [
+    ('ix_employees_id', ['id'], {}),
+    ('ix_employees_org_name_id', ['organization_id', 'name', 'id'], {}),
+    ('ix_employees_org_hire_date_id', ['organization_id', 'hire_date', 'id'], {}),
+    ('ix_employees_org_status_department', ['organization_id', 'status', 'department'], {}),
+    ('ix_employees_org_department_position', ['organization_id', 'department', 'position'], {}),
+    ('ix_employees_org_location_department', ['organization_id', 'location', 'department'], {}),
+    ('ix_employees_org_position', ['organization_id', 'position'], {}),
+    ('ix_employees_active_org_department', ['organization_id', 'department'],
+     {'postgresql_where': sa.text("status = 'ACTIVE'")}),
+    ('ix_employees_name_trgm', ['name'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'name': 'gin_trgm_ops'}}),
+]
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'employees')"
+    )).scalar()
+
+
+def _detach_old_table(old_name: str):
+    """Rename employees out of the way and free every name the new table needs."""
+    op.execute(f'ALTER TABLE employees RENAME TO {old_name}')
+    op.execute('ALTER SEQUENCE employees_id_seq OWNED BY NONE')
+    for name, _, _ in EMPLOYEE_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute(f'ALTER TABLE {old_name} DROP CONSTRAINT IF EXISTS employees_organization_id_fkey')
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT employees_pkey TO {old_name}_pkey')
+
+
+def _finish_new_table(old_name: str):
+    """Copy rows across, drop the old table and rebuild indexes and constraints."""
+    op.execute(f'INSERT INTO employees SELECT * FROM {old_name}')
+    op.execute(f'DROP TABLE {old_name}')
+    op.execute('ALTER SEQUENCE employees_id_seq OWNED BY employees.id')
+    op.create_foreign_key('employees_organization_id_fkey', 'employees', 'organizations',
+                          ['organization_id'], ['id'])
+    for name, columns, kwargs in EMPLOYEE_INDEXES:
+        op.create_index(name, 'employees', columns, unique=False, **kwargs)
+    op.execute('ANALYZE employees')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if PARTITION_STRATEGY in ('', 'none') or bind.dialect.name != 'postgresql':
+        return
+    if PARTITION_STRATEGY not in ('hash', 'list'):
+        raise ValueError(f"Unknown EMPLOYEES_PARTITION_STRATEGY '{PARTITION_STRATEGY}'")
+    if _is_partitioned(bind):
+        return
+
+    _detach_old_table('employees_unpartitioned')
+
+    # The partition key must be part of the primary key
+    op.execute(
+        f'CREATE TABLE employees (LIKE employees_unpartitioned INCLUDING DEFAULTS, '
+        f'PRIMARY KEY (id, organization_id)) PARTITION BY {PARTITION_STRATEGY.upper()} (organization_id)'
+    )
+
+    if PARTITION_STRATEGY == 'hash':
+        for remainder in range(HASH_PARTITIONS):
+            op.execute(
+                f'CREATE TABLE employees_p{remainder} PARTITION OF employees '
+                f'FOR VALUES WITH (MODULUS {HASH_PARTITIONS}, REMAINDER {remainder})'
+            )
+    else:
+        organization_ids = bind.execute(sa.text('SELECT id FROM organizations ORDER BY id')).scalars().all()
+        for organization_id in organization_ids:
+            op.execute(f'CREATE TABLE employees_p_org_{organization_id} PARTITION OF employees '
+                       f'FOR VALUES IN ({organization_id})')
+        op.execute('CREATE TABLE employees_p_default PARTITION OF employees DEFAULT')
+
+    _finish_new_table('employees_unpartitioned')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not _is_partitioned(bind):
+        return
+
+    _detach_old_table('employees_partitioned')
+    op.execute('CREATE TABLE employees (LIKE employees_partitioned INCLUDING DEFAULTS, PRIMARY KEY (id))')
+    _finish_new_table('employees_partitioned')
@@ -0,0 +1,47 @@
+"""add employee natural key
+
+Unique (organization_id, email) index used as the ON CONFLICT target of bulk
+ingestion. The upgrade refuses to run while duplicate pairs exist; resolve them
+first (the offending pairs are listed in the error).
+
+Revision ID: c4f6a8b0d257
+Revises: b1d3f5a7c926
+Create Date: 2026-10-18 14:05:31.662814
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f6a8b0d257'
+down_revision: Union[str, None] = 'b1d3f5a7c926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(
+        'SELECT organization_id, email, COUNT(*) FROM employees '
+        'GROUP BY organization_id, email HAVING COUNT(*) > 1 LIMIT 20'
+    )).fetchall()
+    if duplicates:
+        pairs = ', '.join(f'({org}, {email}) x{count}' for org, email, count in duplicates)
+        raise RuntimeError(f'Duplicate (organization_id, email) pairs must be resolved first: {pairs}')
+
+    is_postgresql = bind.dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        # CONCURRENTLY is not supported on partitioned tables
+        partitioned = is_postgresql and bind.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'employees')"
+        )).scalar()
+        op.create_index('uq_employees_org_email', 'employees', ['organization_id', 'email'], unique=True,
+                        postgresql_concurrently=is_postgresql and not partitioned)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_employees_org_email', table_name='employees')
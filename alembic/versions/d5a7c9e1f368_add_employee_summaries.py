@@ -0,0 +1,54 @@
+"""add employee summaries
+
+Per (organization_id, department, location, status) headcount and salary aggregates
+maintained by app.services.employee_summary_service, populated from the existing
+employees.
+
+Revision ID: d5a7c9e1f368
+Revises: c4f6a8b0d257
+Create Date: 2026-10-18 16:42:09.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c9e1f368'
+down_revision: Union[str, None] = 'c4f6a8b0d257'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The enum type already exists (created with employees)
+    status_enum = postgresql.ENUM('ACTIVE', 'NOT_STARTED', 'TERMINATED', name='employee_status_enum',
+                                  create_type=False)
+    op.create_table(
+        'employee_summaries',
+        sa.Column('organization_id', sa.Integer(), sa.ForeignKey('organizations.id'), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=False),
+        sa.Column('status', status_enum, nullable=False),
+        sa.Column('headcount', sa.Integer(), nullable=False),
+        sa.Column('salary_count', sa.Integer(), nullable=False),
+        sa.Column('salary_sum', sa.Float(), nullable=True),
+        sa.Column('salary_min', sa.Float(), nullable=True),
+        sa.Column('salary_max', sa.Float(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('organization_id', 'department', 'location', 'status'),
+    )
+    op.execute(
+        'INSERT INTO employee_summaries '
+        '(organization_id, department, location, status, headcount, salary_count, salary_sum, salary_min, salary_max) '
+        'SELECT organization_id, department, location, status, COUNT(id), COUNT(salary), SUM(salary), '
+        'MIN(salary), MAX(salary) FROM employees WHERE status IS NOT NULL '
+        'GROUP BY organization_id, department, location, status'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('employee_summaries')
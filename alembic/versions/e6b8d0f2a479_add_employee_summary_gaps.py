@@ -0,0 +1,43 @@
+"""add employee summary gaps
+
+Per (organization_id, department, location) count of employees without a status,
+maintained by app.services.employee_summary_service so aggregate queries can tell
+whether the summaries cover them without scanning employees. Populated from the
+existing employees.
+
+Revision ID: e6b8d0f2a479
+Revises: d5a7c9e1f368
+Create Date: 2026-10-18 21:12:47.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b8d0f2a479'
+down_revision: Union[str, None] = 'd5a7c9e1f368'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'employee_summary_gaps',
+        sa.Column('organization_id', sa.Integer(), sa.ForeignKey('organizations.id'), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=False),
+        sa.Column('headcount', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('organization_id', 'department', 'location'),
+    )
+    op.execute(
+        'INSERT INTO employee_summary_gaps (organization_id, department, location, headcount) '
+        'SELECT organization_id, department, location, COUNT(id) FROM employees WHERE status IS NULL '
+        'GROUP BY organization_id, department, location'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('employee_summary_gaps')
@@ -1,9 +1,70 @@
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func, select
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Optional, Type, Callable
 from sqlalchemy.orm import Session
+import logging
 
+from app.db import use_primary
+
+logger = logging.getLogger(__name__)
+
+# Callbacks run after a successful write, keyed by model class
+_write_hooks: Dict[Any, List[Callable]] = {}
+
+
+def register_write_hook(model: Any, hook: Callable):
+    """
+    Register a callback invoked as hook(db, entry, previous) after an entry of the given
+    model is created or updated through this module. `previous` holds the pre-update
+    values of the changed fields, or None for newly created entries.
+    Used to invalidate or maintain derived data.
+    """
+    _write_hooks.setdefault(model, []).append(hook)
+
+
+def run_write_hooks(db: Session, model: Any, entry: Any, previous: Optional[dict] = None):
+    """Run every hook registered for the model; hook failures are logged, never raised."""
+    for hook in _write_hooks.get(model, []):
+        try:
+            hook(db, entry, previous)
+        except Exception:
+            logger.exception(f"Write hook {hook.__name__} failed for {model.__name__}")
+
+
+# Callbacks run after a bulk write, keyed by model class
+_bulk_write_hooks: Dict[Any, List[Callable]] = {}
+
+
+def register_bulk_write_hook(model: Any, hook: Callable):
+    """
+    Register a callback invoked as hook(db, organization_ids) after a bulk load of the
+    given model touched rows of those organizations (see employee_ingest_service).
+    """
+    _bulk_write_hooks.setdefault(model, []).append(hook)
+
+
+def run_bulk_write_hooks(db: Session, model: Any, organization_ids: set):
+    """Run every bulk hook registered for the model; hook failures are logged, never raised."""
+    for hook in _bulk_write_hooks.get(model, []):
+        try:
+            hook(db, organization_ids)
+        except Exception:
+            logger.exception(f"Bulk write hook {hook.__name__} failed for {model.__name__}")
+
+
+# Alternative sources for aggregate queries (e.g. summary tables), keyed by model class
+_aggregate_sources: Dict[Any, List[Callable]] = {}
+
+
+def register_aggregate_source(model: Any, source: Callable):
+    """
+    Register a callable that may answer aggregate queries of fetch_model_entries_sync for
+    the model. It is called with the query description as keyword arguments (filter_data,
+    exclude_data, join_model, aggregate_data, group_by, order_by, skip, limit, fetch_one)
+    plus the session, and returns the result, or None when it cannot answer the query.
+    """
+    _aggregate_sources.setdefault(model, []).append(source)
 
 
 def create_model_entry_sync(db:Session, data: dict, model: Any):
@@ -18,6 +79,7 @@ def create_model_entry_sync(db:Session, data: dict, model: Any):
         db.add(database)
         db.commit()
         db.refresh(database)
+        run_write_hooks(db, model, database)
         return database
     except IntegrityError as e:
         db.rollback()
@@ -71,6 +133,16 @@ def fetch_model_entries_sync(
     :return: A single record instance or a list of record instances or aggregated results
     """
 
+    if aggregate_data:
+        for source in _aggregate_sources.get(model, []):
+            result = source(
+                db, filter_data=filter_data, exclude_data=exclude_data, join_model=join_model,
+                aggregate_data=aggregate_data, group_by=group_by, order_by=order_by,
+                skip=skip, limit=limit, fetch_one=fetch_one,
+            )
+            if result is not None:
+                return result
+
     query = db.query(model)
 
     # Apply join if join_model is provided
@@ -174,15 +246,19 @@ def update_model_entry(db:Session, update_data: dict, filter_data: dict, model:
     :param update_data: Dictionary containing the data to update
     :return: The updated record instance
     """
+    # Read-modify-write: never base the update on a lagging replica
+    use_primary(db)
     entry = db.query(model).filter_by(**filter_data).first()
     if not entry:
         raise ValueError(f"Record with ID not found")
 
+    previous = {key: getattr(entry, key, None) for key in update_data}
     for key, value in update_data.items():
         setattr(entry, key, value)
     try:
         db.commit()
         db.refresh(entry)
+        run_write_hooks(db, model, entry, previous)
         return entry
     except IntegrityError as e:
         db.rollback()
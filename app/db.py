@@ -1,12 +1,19 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+import itertools
+import logging
 import os
-from typing import Generator
+import threading
+import time
+from typing import AsyncGenerator, Callable, Dict, Generator, List, Optional
 from dotenv import load_dotenv
 load_dotenv()  
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 DATABASE_URL = os.getenv(
     "DATABASE_URL", 
@@ -16,26 +23,306 @@ DATABASE_URL = os.getenv(
 # For development, you might want to use SQLite
 # DATABASE_URL = "sqlite:///./hr_employees.db"
 
-# Create engine
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL, 
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-else:
+# Callbacks run as listener(pool, wait_seconds) after every pool checkout (see app/utils/metrics.py)
+_pool_checkout_listeners: List[Callable] = []
+
+
+def register_pool_checkout_listener(listener: Callable):
+    _pool_checkout_listeners.append(listener)
+
+
+class _CheckoutTiming:
+    """Pool mixin reporting how long each checkout waited (including connecting)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            for listener in _pool_checkout_listeners:
+                listener(self, waited)
+
+
+class InstrumentedQueuePool(_CheckoutTiming, QueuePool):
+    """QueuePool that reports how long each checkout waited (including connecting)."""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    """The async engines' queue pool, with the same checkout reporting."""
+
+
+# Connection pool (PostgreSQL). With DB_MAX_CONNECTIONS set, the pool size defaults to this
+# worker's share of it (WEB_CONCURRENCY workers) and overflow to 0, so the total stays bounded.
+WEB_CONCURRENCY = max(int(os.getenv("WEB_CONCURRENCY", 1)), 1)
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", 0))  # connection budget of all workers; 0 = unset
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or (max(DB_MAX_CONNECTIONS // WEB_CONCURRENCY, 1) if DB_MAX_CONNECTIONS else 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or (0 if DB_MAX_CONNECTIONS else 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))  # replace connections older than this; -1 = never
+# Liveness check on checkout: always (a round-trip per checkout), idle (only connections idle
+# longer than DB_POOL_PRE_PING_IDLE_SECONDS) or never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle").lower()
+DB_POOL_PRE_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", 30))
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", DB_POOL_SIZE))  # connections opened at startup
+
+PRE_PING_MODES = ("always", "idle", "never")
+if DB_POOL_PRE_PING not in PRE_PING_MODES:
+    raise ValueError(f"DB_POOL_PRE_PING must be one of {PRE_PING_MODES}, got '{DB_POOL_PRE_PING}'")
+
+POOL_SETTINGS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING == "always",
+}
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float = DB_POOL_PRE_PING_IDLE_SECONDS) -> None:
+    """
+    Ping only connections that sat idle in the pool longer than `idle_seconds`; a dead one
+    is discarded and the checkout transparently retried with a fresh connection.
+    """
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            alive = False
+        if not alive:
+            logger.info("Discarding stale pooled connection")
+            raise exc.DisconnectionError("Idle connection failed its liveness check")
+
+    event.listen(engine, "checkin", checkin)
+    event.listen(engine, "checkout", checkout)
+
+
+def warm_up_pool(engine: Engine, connections: int = DB_POOL_WARMUP) -> int:
+    """
+    Open up to `connections` pooled connections (capped at the pool size) so the first
+    requests do not pay the connect cost.
+    :return: Number of connections opened
+    """
+    connections = min(connections, engine.pool.size()) if isinstance(engine.pool, QueuePool) else 0
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+# Read replicas: comma-separated URLs; reads are spread over the healthy ones
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")  # round_robin | least_connections
+DB_REPLICA_HEALTH_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", 10))  # seconds between health checks
+# After an organization's data changes, its reads use the primary for this long (replica lag bound)
+DB_REPLICA_LAG_WINDOW = float(os.getenv("DB_REPLICA_LAG_WINDOW", 10))
+
+
+def make_engine(url: str) -> Engine:
+    """Engine with the project's pool settings for the given database URL."""
+    if url.startswith("sqlite"):
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
     # PostgreSQL configuration
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        pool_size=10,
-        max_overflow=20,
+    pooled_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        **POOL_SETTINGS,
         echo=False  # Set to True for SQL query logging
     )
+    if DB_POOL_PRE_PING == "idle":
+        install_idle_pre_ping(pooled_engine)
+    return pooled_engine
+
+
+class ReplicaSet:
+    """
+    Read replicas with health checks and replica selection.
+
+    A replica is probed with SELECT 1 at most every `health_interval` seconds and is
+    marked down immediately when one of its connections is reported disconnected.
+    `choose()` returns None when no replica is healthy, so reads fall back to the primary.
+    """
+
+    STRATEGIES = ("round_robin", "least_connections")
+
+    def __init__(self, engines: List[Engine], strategy: str = DB_REPLICA_STRATEGY,
+                 health_interval: float = DB_REPLICA_HEALTH_INTERVAL):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy '{strategy}'")
+        self.engines = engines
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self._healthy: Dict[Engine, bool] = {replica: True for replica in engines}
+        self._next_check: Dict[Engine, float] = {replica: 0.0 for replica in engines}
+        self._in_use: Dict[Engine, int] = {replica: 0 for replica in engines}
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+        for replica in engines:
+            self._watch(replica)
+
+    def _watch(self, replica: Engine) -> None:
+        def checkout(*args):
+            self._in_use[replica] += 1
+
+        def checkin(*args):
+            self._in_use[replica] -= 1
+
+        def handle_error(context):
+            if context.is_disconnect:
+                self.mark_down(replica)
+
+        event.listen(replica, "checkout", checkout)
+        event.listen(replica, "checkin", checkin)
+        event.listen(replica, "handle_error", handle_error)
+
+    def mark_down(self, replica: Engine) -> None:
+        logger.warning(f"Read replica {replica.url!r} marked unhealthy")
+        self._healthy[replica] = False
+        self._next_check[replica] = time.monotonic() + self.health_interval
+
+    def _probe(self, replica: Engine) -> bool:
+        try:
+            with replica.connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Read replica {replica.url!r} failed its health check: {e}")
+            return False
+
+    def healthy(self) -> List[Engine]:
+        """Replicas currently considered healthy, re-probing those whose check is due."""
+        now = time.monotonic()
+        due = [replica for replica in self.engines if self._next_check[replica] <= now]
+        if due and self._lock.acquire(blocking=False):
+            # One thread re-probes; the others use the last known state meanwhile
+            try:
+                for replica in due:
+                    was_healthy = self._healthy[replica]
+                    self._healthy[replica] = self._probe(replica)
+                    self._next_check[replica] = time.monotonic() + self.health_interval
+                    if self._healthy[replica] and not was_healthy:
+                        logger.info(f"Read replica {replica.url!r} is healthy again")
+            finally:
+                self._lock.release()
+        return [replica for replica in self.engines if self._healthy[replica]]
+
+    def choose(self) -> Optional[Engine]:
+        candidates = self.healthy()
+        if not candidates:
+            return None
+        if self.strategy == "least_connections":
+            return min(candidates, key=lambda replica: self._in_use[replica])
+        return candidates[next(self._rotation) % len(candidates)]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a read replica and everything else (flushes,
+    INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, raw SQL) to the primary.
+
+    Once a session has written, it reads from the primary too, so a request sees its own
+    writes. The replica is chosen on the first read and kept for the session's lifetime.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.replicas is None or self.info.get("use_primary"):
+            return primary
+        if self._flushing or clause is None or not getattr(clause, "is_select", False) \
+                or getattr(clause, "_for_update_arg", None) is not None:
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info["use_primary"] = True
+            return primary
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.replicas.choose() or primary
+            self.info["replica"] = replica
+        return replica
+
+
+def use_primary(db: Session) -> None:
+    """Route every further statement of the session to the primary (read-modify-write)."""
+    db.info["use_primary"] = True
+
+
+def build_session_factory(primary: Engine, replicas: Optional[ReplicaSet] = None) -> sessionmaker:
+    if replicas is None:
+        return sessionmaker(autocommit=False, autoflush=False, bind=primary)
+    return sessionmaker(autocommit=False, autoflush=False, bind=primary, class_=RoutingSession, replicas=replicas)
+
+
+# Create engine
+engine = make_engine(DATABASE_URL)
+replica_set = ReplicaSet([make_engine(url) for url in DATABASE_REPLICA_URLS]) if DATABASE_REPLICA_URLS else None
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = build_session_factory(engine, replica_set)
+
+# Optional async stack (asyncpg / aiosqlite), enabled with DB_ASYNC=true
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+
+def _default_async_url(url: str) -> str:
+    """Map the sync DATABASE_URL onto the matching async driver."""
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.startswith("postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _default_async_url(DATABASE_URL)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=InstrumentedAsyncQueuePool,
+            **POOL_SETTINGS,
+            echo=False
+        )
+        if DB_POOL_PRE_PING == "idle":
+            install_idle_pre_ping(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def warm_up_async_pool(connections: int = DB_POOL_WARMUP) -> int:
+    """warm_up_pool for the async engine."""
+    if async_engine is None or not isinstance(async_engine.sync_engine.pool, QueuePool):
+        return 0
+    opened = []
+    try:
+        for _ in range(min(connections, async_engine.sync_engine.pool.size())):
+            opened.append(await async_engine.connect())
+    finally:
+        for conn in opened:
+            await conn.close()
+    return len(opened)
 
 # Base class for models
 Base = declarative_base()
@@ -52,6 +339,17 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+# Async dependency to get database session
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependency function to get an AsyncSession (requires DB_ASYNC=true).
+    Yields a session and ensures it's closed after use.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database stack is disabled; set DB_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Function to create all tables (useful for testing)
 def create_tables():
     """Create all database tables"""
@@ -1,15 +1,57 @@
 # main.py
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from app.db import engine, replica_set, warm_up_async_pool, warm_up_pool
 from app.router import hr_router
-from app.middleware import RateLimitMiddleware
+from app.middleware import MetricsMiddleware, RateLimitMiddleware, SQLProfilingMiddleware
+import app.services.tenant_partition_service  # noqa: F401  (registers CRUD write hooks)
+import app.services.employee_summary_service  # noqa: F401  (registers CRUD write hooks and aggregate source)
+from app.services.metrics_service import mark_process_dead
+from app.services.search_log_writer import search_log_writer
+from app.utils import invalidation_channel
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_connection_pools():
+    """Pre-open pooled connections so the first requests after a deploy skip the connect cost."""
+    engines = [engine] + (replica_set.engines if replica_set is not None else [])
+    try:
+        opened = [await run_in_threadpool(warm_up_pool, pooled_engine) for pooled_engine in engines]
+        opened.append(await warm_up_async_pool())
+        logger.info(f"Warmed up {sum(opened)} database connections")
+    except Exception as e:
+        # Not fatal: connections are opened on demand as before
+        logger.warning(f"Connection pool warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_connection_pools()
+    # Startup: follow cache invalidations published by other workers
+    invalidation_channel.start_listener()
+    search_log_writer.start()
+    search_log_writer.replay_spill()
+    yield
+    # Shutdown: write out buffered search logs before the process exits
+    search_log_writer.stop()
+    invalidation_channel.stop_listener()
+    mark_process_dead(os.getpid())
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="HR Employee Search API",
     description="Employee search directory API for HR companies",
     version="1.0.0",
-    docs_url='/docs'
+    docs_url='/docs',
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -22,6 +64,9 @@ app.add_middleware(
 )
 
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(SQLProfilingMiddleware)
+# Outermost, so rate-limited requests are timed too
+app.add_middleware(MetricsMiddleware)
 app.include_router(hr_router)
 
 
@@ -1,41 +1,185 @@
 import time
-import threading
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from urllib.parse import parse_qsl
+from fastapi.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
 from dotenv import load_dotenv
-load_dotenv() 
+
+from app.db import async_engine, engine, replica_set
+from app.utils.metrics import RATE_LIMIT_REJECTIONS, REQUEST_LATENCY
+from app.utils.rate_limiter import (
+    InMemoryRateLimiter,
+    RateLimiter,
+    RateLimitRule,
+    RedisRateLimiter,
+    parse_rule_map,
+    rate_limit_headers,
+)
+from app.utils.sql_profiler import (
+    SQL_SLOW_REQUEST_MS,
+    end_profile,
+    install_sql_profiler,
+    log_slow_request,
+    should_profile,
+    start_profile,
+)
+load_dotenv()
 
 # Configuration
 RATE_LIMIT = int(os.getenv("RATE_LIMIT"))  # max requests
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW"))  # per IP, in seconds
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | redis
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))  # in-memory backend only
+# JSON maps of "<limit>/<window seconds>", e.g. '{"/api/employees/search": "60/60"}'
+RATE_LIMIT_ROUTES = os.getenv("RATE_LIMIT_ROUTES")
+# Keyed by organization_id query parameter; "*" applies to every organization
+RATE_LIMIT_ORGANIZATIONS = os.getenv("RATE_LIMIT_ORGANIZATIONS")
+
+
+def build_rate_limiter() -> RateLimiter:
+    """Create the rate limiter described by the environment configuration."""
+    if RATE_LIMIT_BACKEND == "redis":
+        backend = RedisRateLimiter.from_url(RATE_LIMIT_REDIS_URL)
+    elif RATE_LIMIT_BACKEND == "memory":
+        backend = InMemoryRateLimiter(max_keys=RATE_LIMIT_MAX_KEYS)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{RATE_LIMIT_BACKEND}'")
+
+    return RateLimiter(
+        backend=backend,
+        default_rule=RateLimitRule(scope="ip", limit=RATE_LIMIT, window=RATE_LIMIT_WINDOW),
+        route_rules=parse_rule_map(RATE_LIMIT_ROUTES, scope="route"),
+        organization_rules=parse_rule_map(RATE_LIMIT_ORGANIZATIONS, scope="organization"),
+    )
+
+
+def _organization_id(query_string: bytes):
+    """Extract organization_id from a raw query string without building a Request."""
+    if b"organization_id" not in query_string:
+        return None
+    for key, value in parse_qsl(query_string.decode("latin-1")):
+        if key == "organization_id":
+            return value
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI rate limiting middleware. Unlike BaseHTTPMiddleware it does not wrap the
+    request and response in extra tasks and streams: allowed requests are passed straight
+    to the app and only the response start message is touched to add RateLimit-* headers.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter or build_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        check_args = (client_ip, scope["path"], _organization_id(scope.get("query_string", b"")))
+        if self.limiter.blocking:
+            result = await run_in_threadpool(self.limiter.check, *check_args)
+        else:
+            result = self.limiter.check(*check_args)
+        headers = rate_limit_headers(result)
+
+        if not result.allowed:
+            RATE_LIMIT_REJECTIONS.inc()
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "status": 429,
+                    "message": "Rate limit exceeded. Try again later."
+                },
+                headers=headers
+            )
+            await response(scope, receive, send)
+            return
+
+        raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency per route template (e.g.
+    /api/employees/search, never the raw URL) and response status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class SQLProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling a sample (SQL_PROFILE_SAMPLE_RATE) of requests: every
+    SQL statement is timed through engine events, the response gets a Server-Timing header
+    splitting database and application time, and requests slower than SQL_SLOW_REQUEST_MS
+    are logged with the plans of their slowest queries.
+    """
+
+    def __init__(self, app: ASGIApp, engines=None):
+        self.app = app
+        if engines is None:
+            engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+            engines += replica_set.engines if replica_set is not None else []
+        for profiled_engine in engines:
+            install_sql_profiler(profiled_engine)
+        self.explain_engine = engine
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(scope["method"], scope["path"])
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                timing = (b"server-timing", profile.server_timing().encode("latin-1"))
+                message["headers"] = list(message.get("headers", [])) + [timing]
+            await send(message)
 
-# In-memory storage for rate-limiting
-request_log = {}
-lock = threading.Lock()
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        current_time = time.time()
-
-        with lock:
-            log = request_log.setdefault(client_ip, [])
-            # Remove old timestamps outside the window
-            request_log[client_ip] = [t for t in log if t > current_time - RATE_LIMIT_WINDOW]
-
-            if len(request_log[client_ip]) >= RATE_LIMIT:
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "status": 429,
-                        "message": "Rate limit exceeded. Try again later."
-                    }
-                )
-
-            # Allow this request
-            request_log[client_ip].append(current_time)
-
-        response = await call_next(request)
-        return response
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profile.finish()
+            end_profile(token)
+            if profile.total_seconds * 1000 >= SQL_SLOW_REQUEST_MS and profile.query_count:
+                # EXPLAIN runs blocking queries; keep them off the event loop
+                await run_in_threadpool(log_slow_request, profile, self.explain_engine)
@@ -1,8 +1,8 @@
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Index
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Index, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from datetime import datetime
 from sqlalchemy import Column, Enum as SqlEnum, String
 
@@ -47,8 +47,65 @@ class Employee(Base):
     
     # Relationship
     organization = relationship("Organization", back_populates="employees")
+
+    __table_args__ = (
+        # Keyset pagination indexes (organization, sort key, id)
+        Index("ix_employees_org_name_id", "organization_id", "name", "id"),
+        Index("ix_employees_org_hire_date_id", "organization_id", "hire_date", "id"),
+        # Natural key used by bulk ingestion upserts (ON CONFLICT)
+        Index("uq_employees_org_email", "organization_id", "email", unique=True),
+        # Equality-filter indexes shaped to the search endpoint's filter combinations
+        Index("ix_employees_org_status_department", "organization_id", "status", "department"),
+        Index("ix_employees_org_department_position", "organization_id", "department", "position"),
+        Index("ix_employees_org_location_department", "organization_id", "location", "department"),
+        Index("ix_employees_org_position", "organization_id", "position"),
+        Index("ix_employees_active_org_department", "organization_id", "department",
+              postgresql_where=text("status = 'ACTIVE'"), sqlite_where=text("status = 'ACTIVE'")),
+        # Trigram index for substring/similarity name search (PostgreSQL, needs pg_trgm)
+        Index("ix_employees_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
     
 
+event.listen(
+    Employee.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class EmployeeSummary(Base):
+    """
+    Headcount and salary aggregates per (organization, department, location, status),
+    kept current by app.services.employee_summary_service.
+    """
+    __tablename__ = "employee_summaries"
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    department = Column(String(100), primary_key=True)
+    location = Column(String(100), primary_key=True)
+    status = Column(SqlEnum(EmployeeStatus, name="employee_status_enum"), primary_key=True)
+    headcount = Column(Integer, nullable=False, default=0)
+    salary_count = Column(Integer, nullable=False, default=0)  # employees with a salary
+    salary_sum = Column(Float, nullable=True)
+    salary_min = Column(Float, nullable=True)
+    salary_max = Column(Float, nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class EmployeeSummaryGap(Base):
+    """
+    Number of employees without a status per (organization, department, location): they have
+    no employee_summaries group, so aggregate queries that would match them skip the summaries.
+    """
+    __tablename__ = "employee_summary_gaps"
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    department = Column(String(100), primary_key=True)
+    location = Column(String(100), primary_key=True)
+    headcount = Column(Integer, nullable=False, default=0)
+
+
 class OrganizationColumnConfig(Base):
     __tablename__ = "organization_column_configs"
     
@@ -1,15 +1,29 @@
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.db_crud_operation import fetch_model_entries_sync
-from app.db import get_db
+from app.db import DB_ASYNC, get_async_db, get_db
 from app.models import Employee, EmployeeStatus, OrganizationColumnConfig
-from app.schema.employee_search_schema import EmployeeSearchRequest
-from app.services.employee_search_service import employee_search_helper
-from app.utils.api_request_handler import handle_api_request
+from app.schema.employee_ingest_schema import IngestFormat
+from app.schema.employee_search_schema import EmployeeExportRequest, EmployeeSearchBatchRequest, EmployeeSearchRequest
+from app.services.employee_batch_search_service import (
+    employee_search_batch_helper,
+    employee_search_batch_helper_async,
+)
+from app.services.data_version_service import data_versions
+from app.services.employee_export_service import employee_export_helper
+from app.services.employee_ingest_service import employee_ingest_helper, spool_request_body
+from app.services.metrics_service import render_metrics
+from app.services.employee_search_service import employee_search_helper, employee_search_helper_async
+from app.services.search_cache_service import SEARCH_CACHE_CONTROL, search_etag
+from app.utils.api_request_handler import handle_api_request, handle_api_request_async
+from app.utils.http_cache_utils import conditional_headers, etag_matches
 from app.utils.model_utils import model_to_dict
 
 hr_router = APIRouter()
@@ -22,14 +36,99 @@ async def health_check():
     }
 
 
-@hr_router.get("/api/employees/search")
-def search_employees(request: Request, db: Session = Depends(get_db)):
+@hr_router.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+def _request_etag(request: Request) -> Optional[str]:
+    """ETag for the search described by the query string, or None if it does not validate."""
+    try:
+        return search_etag(EmployeeSearchRequest(**dict(request.query_params)))
+    except ValidationError:
+        return None
+
+
+def _conditional_response(request: Request, etag: Optional[str]) -> Optional[Response]:
+    if etag and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=conditional_headers(etag, SEARCH_CACHE_CONTROL))
+    return None
+
+
+def _search_response(response, etag: Optional[str]):
+    """
+    Wrap the helper's dict in an ORJSONResponse ourselves: returning the dict would make
+    FastAPI run it through jsonable_encoder first. Dates, enums and floats are encoded
+    natively by orjson.
+    """
+    if not isinstance(response, dict):
+        return response
+    headers = conditional_headers(etag, SEARCH_CACHE_CONTROL) if etag and response.get("status") == 200 else None
+    return ORJSONResponse(content=response, headers=headers)
+
+
+if DB_ASYNC:
+    @hr_router.get("/api/employees/search")
+    async def search_employees(request: Request, db: AsyncSession = Depends(get_async_db)):
+        if data_versions.blocking:
+            etag = await run_in_threadpool(_request_etag, request)
+        else:
+            etag = _request_etag(request)
+        not_modified = _conditional_response(request, etag)
+        if not_modified:
+            return not_modified
+
+        response = await handle_api_request_async(
+            request=request,
+            db=db,
+            query_schema=EmployeeSearchRequest,
+            helper_function=employee_search_helper_async,
+        )
+        return _search_response(response, etag)
+else:
+    @hr_router.get("/api/employees/search")
+    def search_employees(request: Request, db: Session = Depends(get_db)):
+        etag = _request_etag(request)
+        not_modified = _conditional_response(request, etag)
+        if not_modified:
+            return not_modified
+
+        response = handle_api_request(
+            request=request,
+            db=db,
+            query_schema=EmployeeSearchRequest,
+            helper_function=employee_search_helper,
+        )
+        return _search_response(response, etag)
+
+
+@hr_router.post("/api/employees/search/batch")
+async def search_employees_batch(request: Request, db=Depends(get_async_db if DB_ASYNC else get_db)):
+    response = await handle_api_request_async(
+        request=request,
+        db=db,
+        schema=EmployeeSearchBatchRequest,
+        helper_function=employee_search_batch_helper_async if DB_ASYNC else employee_search_batch_helper,
+    )
+    return _search_response(response, None)
+
+
+@hr_router.get("/api/employees/export")
+def export_employees(request: Request, db: Session = Depends(get_db)):
     return handle_api_request(
         request=request,
         db=db,
-        query_schema=EmployeeSearchRequest,
-        helper_function=employee_search_helper,
+        query_schema=EmployeeExportRequest,
+        helper_function=employee_export_helper,
+        accept_encoding=request.headers.get("accept-encoding"),
     )
 
 
-   
\ No newline at end of file
+@hr_router.post("/api/employees/bulk")
+async def bulk_ingest_employees(request: Request, format: Optional[IngestFormat] = None, db: Session = Depends(get_db)):
+    if format is None:
+        is_csv = "csv" in request.headers.get("content-type", "")
+        format = IngestFormat.CSV if is_csv else IngestFormat.NDJSON
+    body = await spool_request_body(request.stream(), request.headers.get("content-encoding"))
+    return ORJSONResponse(await run_in_threadpool(employee_ingest_helper, db, body, format))
@@ -0,0 +1,41 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.models import EmployeeStatus
+
+
+class IngestFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class EmployeeIngestRecord(BaseModel):
+    """One employee row of a bulk ingestion stream; (organization_id, email) identifies it."""
+    organization_id: int = Field(..., gt=0)
+    email: str = Field(..., min_length=3, max_length=255)
+    name: str = Field(..., min_length=1, max_length=255)
+    phone: Optional[str] = Field(None, max_length=20)
+    department: str = Field(..., min_length=1, max_length=100)
+    position: str = Field(..., min_length=1, max_length=100)
+    location: str = Field(..., min_length=1, max_length=100)
+    hire_date: date
+    salary: Optional[float] = Field(None, ge=0)
+    status: EmployeeStatus = EmployeeStatus.ACTIVE
+
+    @field_validator("phone", "salary", "status", mode="before")
+    @classmethod
+    def empty_as_missing(cls, value, info):
+        # CSV has no null: an empty cell means "not provided"
+        if value == "":
+            return EmployeeStatus.ACTIVE if info.field_name == "status" else None
+        return value
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, value: str) -> str:
+        if "@" not in value:
+            raise ValueError("not a valid email address")
+        return value.strip()
@@ -5,10 +5,36 @@ import re
 
 
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 from app.models import EmployeeStatus
 
+
+class PaginationMode(str, Enum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+class EmployeeSortField(str, Enum):
+    NAME = "name"
+    HIRE_DATE = "hire_date"
+
+
+class FacetField(str, Enum):
+    DEPARTMENT = "department"
+    LOCATION = "location"
+    POSITION = "position"
+    STATUS = "status"
+
+
 class EmployeeSearchRequest(BaseModel):
     organization_id: int = Field(..., description="Organization ID")
     name: Optional[str] = Field(None, description="Employee name")
@@ -18,3 +44,63 @@ class EmployeeSearchRequest(BaseModel):
     status: Optional[EmployeeStatus] = Field(None, description="Employment status")
     offset: int = Field(0, ge=0, description="Offset for pagination")
     limit: int = Field(10, ge=1, le=100, description="Max number of results to return")
+    pagination_mode: PaginationMode = Field(PaginationMode.OFFSET, description="Offset or keyset (cursor) pagination")
+    cursor: Optional[str] = Field(None, description="Opaque cursor returned as next_cursor by the previous page")
+    sort_by: EmployeeSortField = Field(EmployeeSortField.NAME, description="Sort key for cursor pagination (ties broken by id)")
+    count_strategy: CountStrategy = Field(CountStrategy.EXACT, description="How the total is computed: exact, estimated, cached or none")
+    facets: List[FacetField] = Field(default_factory=list, description="Comma-separated fields to return grouped counts for: department, location, position, status")
+
+    @field_validator("name", "department", "position", "location", "cursor", mode="before")
+    @classmethod
+    def blank_as_missing(cls, value):
+        # "?department=" or "?department=%20" means no department filter
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def accept_member_form(cls, value):
+        # str()/f-string of an EmployeeStatus on Python < 3.12 is "EmployeeStatus.ACTIVE"
+        if isinstance(value, str) and value.startswith(f"{EmployeeStatus.__name__}."):
+            return value.split(".", 1)[1]
+        return value
+
+    @field_validator("facets", mode="before")
+    @classmethod
+    def split_facets(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    @field_validator("facets")
+    @classmethod
+    def normalize_facets(cls, value: List[FacetField]) -> List[FacetField]:
+        # Stable order so equal requests share cache entries
+        return [field for field in FacetField if field in value]
+
+
+MAX_BATCH_SEARCHES = 50
+
+
+class EmployeeSearchBatchRequest(BaseModel):
+    """Several searches of one organization answered in a single request."""
+    searches: List[EmployeeSearchRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SEARCHES,
+                                                  description="Searches to run, answered in the same order")
+
+    @model_validator(mode="after")
+    def single_organization(self):
+        if len({search.organization_id for search in self.searches}) > 1:
+            raise ValueError("All searches in a batch must use the same organization_id")
+        return self
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class EmployeeExportRequest(EmployeeSearchRequest):
+    """Search filters for bulk export; paging fields are ignored, every match is streamed."""
+    format: ExportFormat = Field(ExportFormat.NDJSON, description="ndjson or csv")
+    gzip: bool = Field(False, description="Compress the stream (also enabled by Accept-Encoding: gzip)")
@@ -0,0 +1,59 @@
+import logging
+import os
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import register_write_hook
+from app.models import OrganizationColumnConfig
+from app.utils import invalidation_channel
+from app.utils.cache_utils import TTLCache
+from app.utils.metrics import record_cache_lookup
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+COLUMN_CONFIG_CACHE_TTL = float(os.getenv("COLUMN_CONFIG_CACHE_TTL", 300))  # seconds
+COLUMN_CONFIG_CACHE_SIZE = int(os.getenv("COLUMN_CONFIG_CACHE_SIZE", 1024))  # organizations
+
+INVALIDATION_KIND = "column_config"
+
+column_config_cache = TTLCache(max_size=COLUMN_CONFIG_CACHE_SIZE, ttl=COLUMN_CONFIG_CACHE_TTL)
+
+
+def get_visible_columns(db: Session, organization_id: int) -> Tuple[str, ...]:
+    """
+    Return the organization's visible employee columns in display order, served from
+    the in-process cache when possible.
+    """
+    columns = column_config_cache.get(organization_id)
+    record_cache_lookup("column_config", columns is not None)
+    if columns is None:
+        config_entries = db.query(OrganizationColumnConfig).filter_by(
+            organization_id=organization_id,
+            is_visible=1
+        ).order_by(OrganizationColumnConfig.display_order, OrganizationColumnConfig.id).all()
+        columns = tuple(entry.column_name for entry in config_entries)
+        column_config_cache.set(organization_id, columns)
+    return columns
+
+
+def invalidate_column_config(organization_id: int, broadcast: bool = True) -> None:
+    """Drop the cached column list for an organization, optionally in every worker."""
+    column_config_cache.delete(organization_id)
+    if broadcast:
+        invalidation_channel.publish(INVALIDATION_KIND, organization_id)
+
+
+def _invalidate_on_config_write(db: Session, entry: OrganizationColumnConfig, previous: Optional[dict]):
+    invalidate_column_config(entry.organization_id)
+    if previous and previous.get("organization_id") not in (None, entry.organization_id):
+        invalidate_column_config(previous["organization_id"])
+
+
+register_write_hook(OrganizationColumnConfig, _invalidate_on_config_write)
+invalidation_channel.subscribe(
+    INVALIDATION_KIND, lambda organization_id: invalidate_column_config(organization_id, broadcast=False)
+)
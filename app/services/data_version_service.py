@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import register_bulk_write_hook, register_write_hook
+from app.db import DB_REPLICA_LAG_WINDOW, WEB_CONCURRENCY, use_primary
+from app.models import Employee, OrganizationColumnConfig
+from app.utils import invalidation_channel
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+DATA_VERSION_BACKEND = os.getenv("DATA_VERSION_BACKEND", "memory")  # memory | redis
+DATA_VERSION_REDIS_URL = os.getenv("DATA_VERSION_REDIS_URL", "redis://localhost:6379/0")
+
+INVALIDATION_KIND = "data_version"
+
+
+class InMemoryDataVersions:
+    """
+    Per-organization generation counters held in this process. The process nonce makes
+    versions from different workers or restarts distinct, so they never collide.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self.nonce = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._changed_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, organization_id: int) -> str:
+        return f"{self.nonce}.{self._versions.get(organization_id, 0)}"
+
+    def bump(self, organization_id: int) -> None:
+        with self._lock:
+            self._versions[organization_id] = self._versions.get(organization_id, 0) + 1
+            self._changed_at[organization_id] = time.time()
+
+    def changed_at(self, organization_id: int) -> Optional[float]:
+        """Unix time of the organization's last change seen by this process, if any."""
+        return self._changed_at.get(organization_id)
+
+
+class RedisDataVersions:
+    """Per-organization generation counters shared by every worker through Redis."""
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "data_version"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisDataVersions":
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, organization_id: int) -> str:
+        return f"r.{int(self.client.get(f'{self.prefix}:{organization_id}') or 0)}"
+
+    def bump(self, organization_id: int) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.incr(f"{self.prefix}:{organization_id}")
+        pipeline.set(f"{self.prefix}:{organization_id}:at", time.time(), ex=max(int(DB_REPLICA_LAG_WINDOW), 1))
+        pipeline.execute()
+
+    def changed_at(self, organization_id: int) -> Optional[float]:
+        """Unix time of the organization's last change, if within DB_REPLICA_LAG_WINDOW."""
+        value = self.client.get(f"{self.prefix}:{organization_id}:at")
+        return float(value) if value is not None else None
+
+
+def build_data_versions():
+    if DATA_VERSION_BACKEND == "redis":
+        return RedisDataVersions.from_url(DATA_VERSION_REDIS_URL)
+    if DATA_VERSION_BACKEND == "memory":
+        if WEB_CONCURRENCY > 1:
+            logger.warning("DATA_VERSION_BACKEND=memory with several workers: search ETags differ per "
+                           "worker and restart; set DATA_VERSION_BACKEND=redis to share them")
+        return InMemoryDataVersions()
+    raise ValueError(f"Unknown DATA_VERSION_BACKEND '{DATA_VERSION_BACKEND}'")
+
+
+data_versions = build_data_versions()
+
+
+def get_data_version(organization_id: int) -> str:
+    """Current version of an organization's searchable data (employees and column configs)."""
+    return data_versions.get(organization_id)
+
+
+def bump_data_version(organization_id: int, broadcast: bool = True) -> None:
+    """
+    Mark an organization's data as changed. In-memory versions are also bumped in other
+    workers through the invalidation channel; Redis versions are already shared.
+    """
+    data_versions.bump(organization_id)
+    if broadcast and isinstance(data_versions, InMemoryDataVersions):
+        invalidation_channel.publish(INVALIDATION_KIND, organization_id)
+
+
+def read_own_writes(db: Session, organization_id: int) -> None:
+    """
+    Route the session's reads to the primary while replicas may still lag behind the
+    organization's last change, so a fresh data version is never paired with a stale
+    replica result (which the search cache and ETags would then keep serving).
+    """
+    if getattr(db, "replicas", None) is None:
+        return
+    changed_at = data_versions.changed_at(organization_id)
+    if changed_at is not None and time.time() - changed_at < DB_REPLICA_LAG_WINDOW:
+        use_primary(db)
+
+
+def _bump_on_write(db: Session, entry, previous: Optional[dict]):
+    bump_data_version(entry.organization_id)
+    if previous and previous.get("organization_id") not in (None, entry.organization_id):
+        bump_data_version(previous["organization_id"])
+
+
+def _bump_on_bulk_write(db: Session, organization_ids: set):
+    for organization_id in organization_ids:
+        bump_data_version(organization_id)
+
+
+register_write_hook(Employee, _bump_on_write)
+register_bulk_write_hook(Employee, _bump_on_bulk_write)
+register_write_hook(OrganizationColumnConfig, _bump_on_write)
+invalidation_channel.subscribe(
+    INVALIDATION_KIND, lambda organization_id: bump_data_version(organization_id, broadcast=False)
+)
@@ -0,0 +1,192 @@
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, func, literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Employee
+from app.schema.employee_search_schema import CountStrategy, EmployeeSearchBatchRequest, EmployeeSearchRequest, PaginationMode
+from app.services.column_config_service import get_visible_columns
+from app.services.data_version_service import read_own_writes
+from app.services.employee_search_service import (
+    SORT_COLUMNS,
+    build_pagination,
+    build_search_filters,
+    run_employee_search,
+)
+from app.services.facet_service import compute_facets
+from app.services.search_count_service import count_matches
+from app.services.search_log_writer import search_log_writer
+from app.utils.metrics import SEARCH_PHASE_SECONDS
+from app.utils.model_utils import compile_row_serializer, projected_columns
+
+logger = logging.getLogger(__name__)
+
+
+def is_combinable(filter_data: EmployeeSearchRequest) -> bool:
+    """
+    Offset-paginated searches without a name filter can share the UNION ALL page query.
+    Cursor pages and relevance-ordered name searches run one by one on the same session.
+    """
+    return (filter_data.pagination_mode == PaginationMode.OFFSET and not filter_data.cursor
+            and not filter_data.name)
+
+
+def _combined_pages(db: Session, searches: List[Tuple[int, EmployeeSearchRequest, List]],
+                    allowed_columns: Tuple[str, ...]) -> Dict[int, List]:
+    """One UNION ALL of every search's page, each member tagged with its batch index."""
+    columns = projected_columns(Employee, allowed_columns, ("id",))
+    members = []
+    for index, filter_data, filters in searches:
+        order = (SORT_COLUMNS[filter_data.sort_by], Employee.id)
+        page = (select(literal(index, Integer).label("batch_index"),
+                       func.row_number().over(order_by=order).label("position"), *columns)
+                .where(*filters)
+                .order_by(*order)
+                .offset(filter_data.offset).limit(filter_data.limit).subquery())
+        # Wrapped so each member keeps its own ORDER BY/LIMIT/OFFSET inside the compound select
+        members.append(select(*page.c))
+
+    # UNION ALL does not preserve the members' row order; restore it from the positions
+    combined = union_all(*members).subquery()
+    pages = {index: [] for index, _, _ in searches}
+    for row in db.execute(select(combined).order_by(combined.c.batch_index, combined.c.position)):
+        pages[row[0]].append(row[2:])
+    return pages
+
+
+def _combined_counts(db: Session, searches: List[Tuple[int, EmployeeSearchRequest, List]]) -> Dict[int, int]:
+    """Exact totals of several searches from one UNION ALL of COUNT(*) queries."""
+    members = [
+        select(literal(index, Integer).label("batch_index"), func.count().label("total"))
+        .select_from(Employee).where(*filters)
+        for index, _, filters in searches
+    ]
+    return dict(db.execute(union_all(*members)).all())
+
+
+def run_employee_search_batch(db: Session, batch: EmployeeSearchBatchRequest) -> Dict:
+    """
+    Execute a batch of searches on one sync Session (and so one pooled connection).
+    Combinable searches are answered by a single page query and a single count query;
+    the rest go through run_employee_search. Responses keep the order of the request.
+    """
+    organization_id = batch.searches[0].organization_id
+    read_own_writes(db, organization_id)
+    with SEARCH_PHASE_SECONDS.labels("column_config").time():
+        allowed_columns = get_visible_columns(db, organization_id)
+
+    responses: List[Optional[Dict]] = [None] * len(batch.searches)
+    combined = []
+    for index, filter_data in enumerate(batch.searches):
+        if is_combinable(filter_data):
+            filters, _ = build_search_filters(db, filter_data)
+            combined.append((index, filter_data, filters))
+        else:
+            responses[index] = run_employee_search(db, filter_data)
+
+    if combined:
+        exact = [search for search in combined if search[1].count_strategy == CountStrategy.EXACT]
+        with SEARCH_PHASE_SECONDS.labels("count_query").time():
+            totals = _combined_counts(db, exact) if exact else {}
+            strategies = {index: CountStrategy.EXACT.value for index, _, _ in exact}
+            for index, filter_data, filters in combined:
+                if index not in totals:
+                    totals[index], strategies[index] = count_matches(
+                        db, db.query(Employee.id).filter(*filters), filter_data
+                    )
+
+        with SEARCH_PHASE_SECONDS.labels("page_query").time():
+            pages = _combined_pages(db, combined, allowed_columns)
+
+        with SEARCH_PHASE_SECONDS.labels("serialization").time():
+            serialize = compile_row_serializer(Employee, allowed_columns, ("id",))
+            for index, filter_data, filters in combined:
+                responses[index] = {
+                    "status": 200,
+                    "message": "Search completed successfully",
+                    "data": [serialize(row) for row in pages[index]],
+                    "pagination": build_pagination(filter_data, totals[index], strategies[index]),
+                }
+
+        for index, filter_data, filters in combined:
+            if filter_data.facets:
+                with SEARCH_PHASE_SECONDS.labels("facets").time():
+                    responses[index]["facets"] = compute_facets(db, filters, filter_data.facets)
+
+    logger.info(f"Batch search completed: {len(batch.searches)} searches, {len(combined)} combined.")
+    return {
+        "status": 200,
+        "message": "Batch search completed successfully",
+        "data": responses,
+    }
+
+
+def log_search_batch(batch: EmployeeSearchBatchRequest, response: Dict, start_time: float) -> None:
+    """Queue a single SearchLog record covering the whole batch."""
+    if response.get("status") != 200:
+        return
+    results_count = 0
+    for result in response["data"]:
+        if result.get("status") == 200:
+            total = result["pagination"]["total"]
+            results_count += total if total is not None else len(result["data"])
+    search_log_writer.enqueue({
+        "organization_id": batch.searches[0].organization_id,
+        "search_filters": json.dumps({"batch": [search.dict() for search in batch.searches]}),
+        "results_count": results_count,
+        "response_time_ms": round((time.time() - start_time) * 1000, 2),
+    })
+
+
+def employee_search_batch_helper(db: Session, batch: EmployeeSearchBatchRequest) -> Dict:
+    start_time = time.time()
+    try:
+        logger.info(f"Received batch search request with {len(batch.searches)} searches")
+        response = run_employee_search_batch(db, batch)
+        log_search_batch(batch, response, start_time)
+        return response
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during batch search: {str(e)}")
+        db.rollback()
+        return {
+            "status": 500,
+            "message": "Internal server error during database operation"
+        }
+
+    except Exception as e:
+        logger.exception("Unexpected error occurred during batch search")
+        return {
+            "status": 500,
+            "message": "An unexpected error occurred"
+        }
+
+
+async def employee_search_batch_helper_async(db: AsyncSession, batch: EmployeeSearchBatchRequest) -> Dict:
+    """Async variant of employee_search_batch_helper; the batch runs via AsyncSession.run_sync."""
+    start_time = time.time()
+    try:
+        logger.info(f"Received batch search request with {len(batch.searches)} searches")
+        response = await db.run_sync(run_employee_search_batch, batch)
+        log_search_batch(batch, response, start_time)
+        return response
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during batch search: {str(e)}")
+        await db.rollback()
+        return {
+            "status": 500,
+            "message": "Internal server error during database operation"
+        }
+
+    except Exception as e:
+        logger.exception("Unexpected error occurred during batch search")
+        return {
+            "status": 500,
+            "message": "An unexpected error occurred"
+        }
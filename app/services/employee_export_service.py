@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import logging
+import os
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+import orjson
+from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Employee
+from app.schema.employee_search_schema import EmployeeExportRequest, ExportFormat
+from app.services.column_config_service import get_visible_columns
+from app.services.data_version_service import read_own_writes
+from app.services.employee_search_service import build_search_filters
+from app.services.search_log_writer import search_log_writer
+from app.utils.model_utils import compile_row_serializer, projected_columns
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))  # rows per server-side cursor fetch
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value):
+    # Match the NDJSON/JSON encodings: ISO timestamps and enum values, not str() forms
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def iter_employee_export(
+        filter_data: EmployeeExportRequest,
+        columns: tuple,
+        session_factory: Callable[[], Session] = SessionLocal,
+) -> Iterator[bytes]:
+    """
+    Yield the export body in chunks of EXPORT_BATCH_SIZE rows. Rows are read through a
+    server-side cursor (stream_results / yield_per), so memory use does not depend on how
+    many employees match.
+    """
+    start_time = time.time()
+    exported = 0
+    db = session_factory()
+    try:
+        read_own_writes(db, filter_data.organization_id)
+        filters, _ = build_search_filters(db, filter_data)
+        # (organization_id, name, id) index order: rows stream without a sort step
+        statement = (
+            select(*projected_columns(Employee, columns, ("id",)))
+            .where(*filters)
+            .order_by(Employee.name, Employee.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        serialize = compile_row_serializer(Employee, columns, ("id",))
+        result = db.execute(statement)
+
+        if filter_data.format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for batch in result.partitions():
+                for row in batch:
+                    writer.writerow([_csv_value(value) for value in serialize(row).values()])
+                exported += len(batch)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if not exported:
+                # Header only
+                yield buffer.getvalue().encode()
+        else:
+            for batch in result.partitions():
+                yield b"".join(orjson.dumps(serialize(row), option=orjson.OPT_APPEND_NEWLINE) for row in batch)
+                exported += len(batch)
+    finally:
+        db.close()
+        search_log_writer.enqueue({
+            "organization_id": filter_data.organization_id,
+            "search_filters": json.dumps({"export": filter_data.dict()}),
+            "results_count": exported,
+            "response_time_ms": round((time.time() - start_time) * 1000, 2),
+        })
+        logger.info(f"Exported {exported} employees for organization {filter_data.organization_id}")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream on the fly into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def employee_export_helper(db: Session, filter_data: EmployeeExportRequest,
+                           accept_encoding: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream every employee matching the search filters as NDJSON or CSV, limited to the
+    organization's visible columns, gzip-compressed when requested.
+    """
+    columns = get_visible_columns(db, filter_data.organization_id)
+    body = iter_employee_export(filter_data, columns)
+    headers = {
+        "Content-Disposition": f'attachment; filename="employees-{filter_data.organization_id}.{filter_data.format.value}"'
+    }
+    if filter_data.gzip or "gzip" in (accept_encoding or ""):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[filter_data.format], headers=headers)
@@ -0,0 +1,265 @@
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import run_bulk_write_hooks
+from app.models import Employee, Organization
+from app.schema.employee_ingest_schema import EmployeeIngestRecord, IngestFormat
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 5000))  # rows validated and merged per transaction
+INGEST_MAX_ERRORS = int(os.getenv("INGEST_MAX_ERRORS", 1000))  # row errors kept in the report
+
+NATURAL_KEY = ("organization_id", "email")
+INGEST_COLUMNS = tuple(EmployeeIngestRecord.model_fields)
+UPDATE_COLUMNS = tuple(name for name in INGEST_COLUMNS if name not in NATURAL_KEY)
+STAGING_TABLE = "employee_ingest_staging"
+
+
+def parse_records(lines: Iterable[str], fmt: IngestFormat) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Parse a CSV (with header row) or NDJSON stream lazily.
+    Yields (row number, record, None) or (row number, None, parse error); row numbers
+    count data rows from 1.
+    """
+    if fmt == IngestFormat.CSV:
+        reader = csv.DictReader(lines)
+        for row_number, row in enumerate(reader, start=1):
+            if None in row:
+                yield row_number, None, "more values than header columns"
+            else:
+                yield row_number, row, None
+        return
+
+    row_number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield row_number, record, None
+        else:
+            yield row_number, None, "expected a JSON object"
+
+
+def _chunks(records: Iterator, size: int) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_upsert(db: Session, rows: List[Dict]) -> None:
+    """PostgreSQL: COPY the chunk into a temporary staging table, then merge it with one INSERT ... ON CONFLICT."""
+    db.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DELETE ROWS AS "
+        f"SELECT {', '.join(INGEST_COLUMNS)} FROM employees WITH NO DATA"
+    ))
+    db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # Empty unquoted CSV fields are NULL for COPY
+        writer.writerow([_copy_value(row[name]) for name in INGEST_COLUMNS])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {STAGING_TABLE} ({', '.join(INGEST_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+    staging = table(STAGING_TABLE, *[column(name) for name in INGEST_COLUMNS])
+    statement = postgresql_insert(Employee).from_select(INGEST_COLUMNS, select(*staging.columns))
+    db.execute(statement.on_conflict_do_update(
+        index_elements=list(NATURAL_KEY),
+        set_={**{name: statement.excluded[name] for name in UPDATE_COLUMNS}, "updated_at": text("now()")},
+    ))
+
+
+def _copy_value(value):
+    if value is None:
+        return ""
+    return getattr(value, "value", value)
+
+
+def _batch_upsert(db: Session, rows: List[Dict]) -> None:
+    """SQLite: one executemany INSERT ... ON CONFLICT DO UPDATE per chunk."""
+    statement = sqlite_insert(Employee)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=list(NATURAL_KEY),
+        set_={**{name: statement.excluded[name] for name in UPDATE_COLUMNS}, "updated_at": func.now()},
+    ), rows)
+
+
+def _merge(db: Session, rows: List[Dict]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        _copy_upsert(db, rows)
+    elif dialect == "sqlite":
+        _batch_upsert(db, rows)
+    else:
+        raise NotImplementedError(f"Bulk ingestion is not supported on {dialect}; use PostgreSQL or SQLite")
+
+
+def _validate_chunk(db: Session, chunk: List[Tuple], errors: List[Dict]) -> Dict[Tuple, Tuple[int, Dict]]:
+    """
+    Validate a chunk of parsed rows. Returns valid rows keyed by natural key (a later row
+    for the same key replaces an earlier one, as ON CONFLICT cannot touch a row twice in
+    one statement) and appends an entry to `errors` for every rejected row.
+    """
+    valid: Dict[Tuple, Tuple[int, Dict]] = {}
+    for row_number, record, parse_error in chunk:
+        if parse_error:
+            errors.append({"row": row_number, "error": parse_error})
+            continue
+        try:
+            row = EmployeeIngestRecord(**record).model_dump()
+        except ValidationError as e:
+            messages = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            errors.append({"row": row_number, "error": messages})
+            continue
+        valid[(row["organization_id"], row["email"])] = (row_number, row)
+
+    organization_ids = {key[0] for key in valid}
+    known = set(db.execute(select(Organization.id).where(Organization.id.in_(organization_ids))).scalars())
+    for key in [key for key in valid if key[0] not in known]:
+        row_number, _ = valid.pop(key)
+        errors.append({"row": row_number, "error": f"organization_id: organization {key[0]} does not exist"})
+    return valid
+
+
+def _merge_rows_individually(db: Session, rows: List[Tuple[int, Dict]], errors: List[Dict]) -> int:
+    """Fallback when a whole chunk fails: merge row by row in savepoints to isolate the bad rows."""
+    loaded = 0
+    for row_number, row in rows:
+        try:
+            with db.begin_nested():
+                _merge(db, [row])
+            loaded += 1
+        except SQLAlchemyError as e:
+            errors.append({"row": row_number, "error": str(getattr(e, "orig", e))})
+    db.commit()
+    return loaded
+
+
+def ingest_employees(db: Session, lines: Iterable[str], fmt: IngestFormat,
+                     chunk_size: int = INGEST_CHUNK_SIZE) -> Dict:
+    """
+    Load a CSV/NDJSON stream of employees, inserting new (organization_id, email) pairs and
+    updating existing ones. Rows are validated and merged `chunk_size` at a time, one
+    transaction per chunk; invalid rows are reported and skipped without aborting the load.
+    :param db: SQLAlchemy session
+    :param lines: Text lines of the stream (a file object or any iterable of lines)
+    :param fmt: IngestFormat.CSV (header row required) or IngestFormat.NDJSON
+    :param chunk_size: Rows per validation/merge batch
+    :return: Report with row counts, errors and throughput in rows/sec
+    """
+    start_time = time.perf_counter()
+    received = loaded = 0
+    errors: List[Dict] = []
+    affected_organizations = set()
+
+    for chunk in _chunks(parse_records(lines, fmt), chunk_size):
+        received += len(chunk)
+        valid = _validate_chunk(db, chunk, errors)
+        if not valid:
+            continue
+        rows = sorted(valid.values(), key=lambda item: item[0])
+        try:
+            _merge(db, [row for _, row in rows])
+            db.commit()
+            loaded += len(rows)
+        except SQLAlchemyError:
+            db.rollback()
+            logger.warning(f"Bulk merge of {len(rows)} rows failed; retrying row by row")
+            loaded += _merge_rows_individually(db, rows, errors)
+        affected_organizations.update(key[0] for key in valid)
+
+    if affected_organizations:
+        run_bulk_write_hooks(db, Employee, affected_organizations)
+
+    elapsed = time.perf_counter() - start_time
+    report = {
+        "received": received,
+        "loaded": loaded,
+        "failed": len(errors),
+        "organizations": sorted(affected_organizations),
+        "elapsed_ms": round(elapsed * 1000, 2),
+        # Throughput of rows actually inserted or updated; rejected rows do not count
+        "rows_per_second": round(loaded / elapsed, 1) if elapsed else 0.0,
+        "errors": sorted(errors, key=lambda error: error["row"])[:INGEST_MAX_ERRORS],
+    }
+    logger.info(f"Ingested {loaded}/{received} employees in {report['elapsed_ms']} ms "
+                f"({report['rows_per_second']} rows/sec), {len(errors)} errors")
+    return report
+
+
+async def spool_request_body(chunks, content_encoding: Optional[str] = None, max_memory: int = 8 * 1024 * 1024):
+    """
+    Copy an async stream of request body chunks into a temporary file (kept in memory up
+    to `max_memory` bytes), decompressing gzip bodies on the fly.
+    :return: The spooled file positioned at the start, as text
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    decompressor = zlib.decompressobj(47) if content_encoding == "gzip" else None  # auto-detect gzip/zlib header
+    async for chunk in chunks:
+        spool.write(decompressor.decompress(chunk) if decompressor else chunk)
+    if decompressor:
+        spool.write(decompressor.flush())
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+
+
+def employee_ingest_helper(db: Session, body, fmt: IngestFormat) -> Dict:
+    """
+    Bulk-load employees from a spooled request body.
+    :param db: SQLAlchemy session
+    :param body: Text file object holding the CSV/NDJSON stream
+    :param fmt: Stream format
+    """
+    try:
+        report = ingest_employees(db, body, fmt)
+        if not report["received"]:
+            return {"status": 400, "message": "Request body contains no rows"}
+        return {"status": 200, "message": "Bulk ingestion completed", "data": report}
+    except UnicodeDecodeError as e:
+        db.rollback()
+        return {"status": 400, "message": f"Body must be UTF-8 encoded: {e}"}
+    except NotImplementedError as e:
+        db.rollback()
+        return {"status": 501, "message": str(e)}
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during bulk ingestion: {str(e)}")
+        db.rollback()
+        return {
+            "status": 500,
+            "message": "Internal server error during database operation"
+        }
+    finally:
+        body.close()
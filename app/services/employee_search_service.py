@@ -1,85 +1,269 @@
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import tuple_
 from fastapi import status
-from typing import List, Dict
-from datetime import datetime
-from app.models import Employee, OrganizationColumnConfig, SearchLog
-from app.schema.employee_search_schema import EmployeeSearchRequest
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Optional, Tuple
+from datetime import date
+from app.models import Employee
+from app.schema.employee_search_schema import EmployeeSearchRequest, EmployeeSortField, PaginationMode
+from app.services.column_config_service import get_visible_columns
+from app.services.facet_service import compute_facets
+from app.services.name_search_service import build_name_search
+from app.services.data_version_service import data_versions, read_own_writes
+from app.services.search_cache_service import (
+    SEARCH_CACHE_ENABLED,
+    get_cached_search,
+    search_cache,
+    search_cache_key,
+    store_cached_search,
+)
+from app.services.search_count_service import count_matches
+from app.services.search_log_writer import search_log_writer
+from app.utils.cursor_utils import decode_cursor, encode_cursor
+from app.utils.metrics import SEARCH_PHASE_SECONDS
+from app.utils.model_utils import compile_row_serializer, projected_columns
 import json
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# Keyset sort columns; every ordering is made stable by appending Employee.id
+SORT_COLUMNS = {
+    EmployeeSortField.NAME: Employee.name,
+    EmployeeSortField.HIRE_DATE: Employee.hire_date,
+}
+
+
+def _sort_value_to_cursor(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _sort_value_from_cursor(sort_by: EmployeeSortField, value):
+    return date.fromisoformat(value) if sort_by == EmployeeSortField.HIRE_DATE else value
+
+
+def paging_key_columns(filter_data: EmployeeSearchRequest) -> Tuple[str, ...]:
+    """Columns a cursor page must select to build the next cursor."""
+    return (SORT_COLUMNS[filter_data.sort_by].key, "id")
+
+
+def paginate_with_cursor(query, filter_data: EmployeeSearchRequest) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page using keyset pagination on (sort column, id).
+    The cost of a page is independent of its depth because the database seeks
+    directly to the last seen key instead of skipping offset rows.
+    :raises ValueError: If the supplied cursor is invalid or was issued for another sort key
+    """
+    sort_by = filter_data.sort_by
+    sort_column = SORT_COLUMNS[sort_by]
+
+    if filter_data.cursor:
+        position = decode_cursor(filter_data.cursor)
+        if position.get("s") != sort_by.value:
+            raise ValueError("Pagination cursor was issued for a different sort order")
+        last_value = _sort_value_from_cursor(sort_by, position.get("v"))
+        query = query.filter(tuple_(sort_column, Employee.id) > tuple_(last_value, position.get("i")))
+
+    # Fetch one extra row to find out whether another page exists
+    rows = query.order_by(sort_column, Employee.id).limit(filter_data.limit + 1).all()
+    page = rows[:filter_data.limit]
+
+    next_cursor = None
+    if len(rows) > filter_data.limit:
+        last = page[-1]
+        next_cursor = encode_cursor({
+            "s": sort_by.value,
+            "v": _sort_value_to_cursor(getattr(last, sort_column.key)),
+            "i": last.id,
+        })
+    return page, next_cursor
+
+
+def build_search_filters(db: Session, filter_data: EmployeeSearchRequest) -> Tuple[List, List]:
+    """
+    Translate the search request into SQL criteria.
+    Every search is scoped to the requesting organization; the organization predicate
+    leads the filter list so it matches the organization-prefixed indexes and lets
+    PostgreSQL prune to a single partition when employees is partitioned.
+    :return: (list of filter criteria, list of relevance ORDER BY expressions)
+    """
+    filters = [Employee.organization_id == filter_data.organization_id]
+    relevance_order = []
+
+    if filter_data.name:
+        name_filter, relevance_order = build_name_search(db, filter_data.name)
+        filters.append(name_filter)
+    if filter_data.department:
+        filters.append(Employee.department == filter_data.department)
+    if filter_data.position:
+        filters.append(Employee.position == filter_data.position)
+    if filter_data.location:
+        filters.append(Employee.location == filter_data.location)
+    if filter_data.status:
+        filters.append(Employee.status == filter_data.status)
+    return filters, relevance_order
+
+
+def build_pagination(filter_data: EmployeeSearchRequest, total_count: Optional[int], count_strategy: str,
+                     use_cursor: bool = False, next_cursor: Optional[str] = None) -> Dict:
+    """The "pagination" block of a search response."""
+    if use_cursor:
+        return {
+            "mode": PaginationMode.CURSOR.value,
+            "total": total_count,
+            "count_strategy": count_strategy,
+            "limit": filter_data.limit,
+            "sort_by": filter_data.sort_by.value,
+            "next_cursor": next_cursor,
+        }
+    return {
+        "total": total_count,
+        "count_strategy": count_strategy,
+        "offset": filter_data.offset,
+        "limit": filter_data.limit,
+    }
+
+
+def run_employee_search(db: Session, filter_data: EmployeeSearchRequest) -> Dict:
+    """
+    Execute the search on a sync Session. Shared by the sync helper and, through
+    AsyncSession.run_sync, by the async helper; errors propagate to the caller.
+    """
+    read_own_writes(db, filter_data.organization_id)
+    filters, relevance_order = build_search_filters(db, filter_data)
+    use_cursor = filter_data.pagination_mode == PaginationMode.CURSOR or filter_data.cursor
+
+    # Get allowed columns for the organization
+    with SEARCH_PHASE_SECONDS.labels("column_config").time():
+        allowed_columns = get_visible_columns(db, filter_data.organization_id)
+
+    # Select only the visible columns plus the paging key as plain rows
+    paging_keys = paging_key_columns(filter_data) if use_cursor else ("id",)
+    query = db.query(*projected_columns(Employee, allowed_columns, paging_keys)).filter(*filters)
+    with SEARCH_PHASE_SECONDS.labels("count_query").time():
+        total_count, count_strategy = count_matches(db, query, filter_data)
+
+
+
+    #pagination
+    next_cursor = None
+    with SEARCH_PHASE_SECONDS.labels("page_query").time():
+        if use_cursor:
+            try:
+                employee_list, next_cursor = paginate_with_cursor(query, filter_data)
+            except ValueError as e:
+                logger.warning(f"Rejected pagination cursor: {e}")
+                return {
+                    "status": 400,
+                    "message": str(e)
+                }
+        else:
+            if relevance_order:
+                query = query.order_by(*relevance_order, Employee.id)
+            else:
+                # Same stable order as cursor pages, so offset pages never overlap or skip rows
+                query = query.order_by(SORT_COLUMNS[filter_data.sort_by], Employee.id)
+            employee_list = query.offset(filter_data.offset).limit(filter_data.limit).all()
+
+    # Serialize employees with only allowed columns
+    with SEARCH_PHASE_SECONDS.labels("serialization").time():
+        serialize = compile_row_serializer(Employee, allowed_columns, paging_keys)
+        serialized_employees = [serialize(row) for row in employee_list]
+
+    response = {
+        "status": 200,
+        "message": "Search completed successfully",
+        "data": serialized_employees,
+        "pagination": build_pagination(filter_data, total_count, count_strategy, use_cursor, next_cursor)
+    }
+    if filter_data.facets:
+        with SEARCH_PHASE_SECONDS.labels("facets").time():
+            response["facets"] = compute_facets(db, filters, filter_data.facets)
+
+    logger.info(f"Search completed with {len(serialized_employees)} results.")
+    return response
+
+
+def log_search(filter_data: EmployeeSearchRequest, response: Dict, start_time: float) -> None:
+    """Queue the SearchLog audit record for a successful search (written asynchronously in batches)."""
+    if response.get("status") != 200:
+        return
+    total = response["pagination"]["total"]
+    search_log_writer.enqueue({
+        "organization_id": filter_data.organization_id,
+        "search_filters": json.dumps(filter_data.dict()),
+        "results_count": total if total is not None else len(response["data"]),
+        "response_time_ms": round((time.time() - start_time) * 1000, 2),
+    })
+
+
 def employee_search_helper(db: Session, filter_data: EmployeeSearchRequest) -> Dict:
     start_time = time.time()
     try:
         logger.info(f"Received employee search request: {filter_data.dict()}")
+        cache_key = search_cache_key(filter_data) if SEARCH_CACHE_ENABLED else None
+        response = get_cached_search(cache_key) if cache_key else None
+        if response is None:
+            response = run_employee_search(db, filter_data)
+            if cache_key and response["status"] == 200:
+                store_cached_search(cache_key, response)
+
+        log_search(filter_data, response, start_time)
+        return response
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during employee search: {str(e)}")
+        db.rollback()
+        return {
+            "status": 500,
+            "message": "Internal server error during database operation"
+        }
 
-        filters = []
-
-        if filter_data.name:
-            filters.append(Employee.name.ilike(f"%{filter_data.name}%"))
-        if filter_data.department:
-            filters.append(Employee.department == filter_data.department)
-        if filter_data.position:
-            filters.append(Employee.position == filter_data.position)
-        if filter_data.location:
-            filters.append(Employee.location == filter_data.location)
-        if filter_data.status:
-            filters.append(Employee.status == filter_data.status)
-    
-        # Query employees with filters
-        query = db.query(Employee).filter(and_(*filters))
-        total_count = query.count()
-
-
-
-        #pagination
-        employee_list: List[Employee] = query.offset(filter_data.offset).limit(filter_data.limit).all()
-
-        # Get allowed columns for the organization
-        config_entries = db.query(OrganizationColumnConfig).filter_by(
-            organization_id=filter_data.organization_id,
-            is_visible=1
-        ).all()
-
-        allowed_columns = [entry.column_name for entry in config_entries]
-
-        # Serialize employees with only allowed columns
-        serialized_employees = []
-        for emp in employee_list:
-            emp_dict = {}
-            for col in allowed_columns:
-                val = getattr(emp, col, None)
-                emp_dict[col] = val.isoformat() if isinstance(val, datetime) else val
-            serialized_employees.append(emp_dict)
-
-        # Log the search
-        db.add(SearchLog(
-            organization_id=filter_data.organization_id,
-            search_filters=json.dumps(filter_data.dict()),
-            results_count=total_count,
-            response_time_ms=round((time.time() - start_time) * 1000, 2)
-        ))
-        db.commit()
-
-        logger.info(f"Search completed with {len(serialized_employees)} results.")
+    except Exception as e:
+        logger.exception("Unexpected error occurred during employee search")
         return {
-            "status": 200,
-            "message": "Search completed successfully",
-            "data": serialized_employees,
-            "pagination": {
-                "total": total_count,
-                "offset": filter_data.offset,
-                "limit": filter_data.limit,
-            }
+            "status": 500,
+            "message": "An unexpected error occurred"
         }
 
+
+async def employee_search_helper_async(db: AsyncSession, filter_data: EmployeeSearchRequest) -> Dict:
+    """
+    Async variant of employee_search_helper for the DB_ASYNC stack. The search runs on the
+    event loop with the async driver, so no threadpool thread is held during database I/O.
+    """
+    start_time = time.time()
+    try:
+        logger.info(f"Received employee search request: {filter_data.dict()}")
+        # Shared (Redis) cache and version lookups are blocking I/O; keep them off the event loop
+        offload = search_cache.blocking or data_versions.blocking
+        cache_key = None
+        response = None
+        if SEARCH_CACHE_ENABLED:
+            if offload:
+                cache_key = await run_in_threadpool(search_cache_key, filter_data)
+                response = await run_in_threadpool(get_cached_search, cache_key)
+            else:
+                cache_key = search_cache_key(filter_data)
+                response = get_cached_search(cache_key)
+
+        if response is None:
+            response = await db.run_sync(run_employee_search, filter_data)
+            if cache_key and response["status"] == 200:
+                if offload:
+                    await run_in_threadpool(store_cached_search, cache_key, response)
+                else:
+                    store_cached_search(cache_key, response)
+
+        log_search(filter_data, response, start_time)
+        return response
+
     except SQLAlchemyError as e:
         logger.error(f"Database error during employee search: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return {
             "status": 500,
             "message": "Internal server error during database operation"
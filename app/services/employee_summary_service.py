@@ -0,0 +1,276 @@
+"""
+Materialized headcount and salary aggregates per (organization, department, location, status).
+
+Rows of employee_summaries are refreshed by CRUD write hooks: a single-employee write
+recomputes the one or two groups it touched, a bulk load rebuilds its organizations.
+fetch_model_entries_sync answers matching Employee aggregate queries from the summaries.
+Employees without a status have no summary group; they are counted in
+employee_summary_gaps instead, and queries they would match fall back to the employees
+table. Writes that bypass the CRUD layer cause drift; repair it with
+
+    python -m app.services.employee_summary_service --rebuild [--organization-id 1 2]
+"""
+import argparse
+import logging
+import os
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import register_aggregate_source, register_bulk_write_hook, register_write_hook
+from app.models import Employee, EmployeeSummary, EmployeeSummaryGap
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EMPLOYEE_SUMMARY_ENABLED = os.getenv("EMPLOYEE_SUMMARY_ENABLED", "true").lower() in ("1", "true", "yes")
+
+GROUP_KEYS = ("organization_id", "department", "location", "status")
+GAP_KEYS = GROUP_KEYS[:-1]
+AGGREGATE_COLUMNS = ("headcount", "salary_count", "salary_sum", "salary_min", "salary_max")
+
+# Organizations whose incremental refresh failed; their queries skip the summaries
+# until a rebuild succeeds (retried on the next write)
+stale_organizations = set()
+
+
+def _group_aggregates():
+    return (
+        func.count(Employee.id).label("headcount"),
+        func.count(Employee.salary).label("salary_count"),
+        func.sum(Employee.salary).label("salary_sum"),
+        func.min(Employee.salary).label("salary_min"),
+        func.max(Employee.salary).label("salary_max"),
+    )
+
+
+def _upsert(db: Session, model, keys, values: dict, updates: dict) -> None:
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(model).values(**values)
+    db.execute(statement.on_conflict_do_update(index_elements=list(keys), set_=updates))
+
+
+def _refresh_gap(db: Session, organization_id: int, department: str, location: str) -> None:
+    """Recount the employees without a status in one (organization, department, location)."""
+    group = dict(zip(GAP_KEYS, (organization_id, department, location)))
+    headcount = db.execute(
+        select(func.count(Employee.id))
+        .where(Employee.status.is_(None), *[getattr(Employee, key) == value for key, value in group.items()])
+    ).scalar()
+    if not headcount:
+        db.execute(delete(EmployeeSummaryGap).where(
+            *[getattr(EmployeeSummaryGap, key) == value for key, value in group.items()]
+        ))
+    else:
+        _upsert(db, EmployeeSummaryGap, GAP_KEYS, {**group, "headcount": headcount}, {"headcount": headcount})
+
+
+def refresh_summary_group(db: Session, organization_id: int, department: str, location: str, status) -> None:
+    """Recompute one summary row from employees (deleting it when the group is empty)."""
+    if status is None:
+        # Not summarized (status is part of the summary key); keep its gap count current
+        _refresh_gap(db, organization_id, department, location)
+        db.commit()
+        return
+    group = dict(zip(GROUP_KEYS, (organization_id, department, location, status)))
+    aggregates = db.execute(
+        select(*_group_aggregates()).where(*[getattr(Employee, key) == value for key, value in group.items()])
+    ).one()._asdict()
+
+    if not aggregates["headcount"]:
+        db.execute(delete(EmployeeSummary).where(
+            *[getattr(EmployeeSummary, key) == value for key, value in group.items()]
+        ))
+    else:
+        _upsert(db, EmployeeSummary, GROUP_KEYS, {**group, **aggregates}, {**aggregates, "refreshed_at": func.now()})
+    db.commit()
+
+
+def rebuild_employee_summaries(db: Session, organization_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the summaries of the given organizations (all when None) from scratch.
+    :return: Number of summary rows written
+    """
+    organization_ids = None if organization_ids is None else list(organization_ids)
+    clear = delete(EmployeeSummary)
+    source = (select(*[getattr(Employee, key) for key in GROUP_KEYS], *_group_aggregates())
+              .where(Employee.status.isnot(None)))
+    clear_gaps = delete(EmployeeSummaryGap)
+    gaps = (select(*[getattr(Employee, key) for key in GAP_KEYS], func.count(Employee.id))
+            .where(Employee.status.is_(None)))
+    if organization_ids is not None:
+        clear = clear.where(EmployeeSummary.organization_id.in_(organization_ids))
+        source = source.where(Employee.organization_id.in_(organization_ids))
+        clear_gaps = clear_gaps.where(EmployeeSummaryGap.organization_id.in_(organization_ids))
+        gaps = gaps.where(Employee.organization_id.in_(organization_ids))
+    source = source.group_by(*[getattr(Employee, key) for key in GROUP_KEYS])
+    gaps = gaps.group_by(*[getattr(Employee, key) for key in GAP_KEYS])
+
+    db.execute(clear)
+    written = db.execute(insert(EmployeeSummary).from_select(GROUP_KEYS + AGGREGATE_COLUMNS, source)).rowcount
+    db.execute(clear_gaps)
+    db.execute(insert(EmployeeSummaryGap).from_select(GAP_KEYS + ("headcount",), gaps))
+    db.commit()
+    if organization_ids is None:
+        stale_organizations.clear()
+    else:
+        stale_organizations.difference_update(organization_ids)
+    logger.info(f"Rebuilt {written} employee summary rows")
+    return written
+
+
+def _mark_stale(db: Session, organization_ids) -> None:
+    """
+    The summary write runs after the employee write has committed, so a failure cannot
+    undo it: flag the organizations for a rebuild instead of failing silently.
+    """
+    db.rollback()
+    stale_organizations.update(organization_ids)
+    logger.exception(f"Employee summary refresh failed; organizations {sorted(organization_ids)} "
+                     f"will be rebuilt")
+
+
+def _repair_stale(db: Session) -> None:
+    if stale_organizations:
+        pending = set(stale_organizations)
+        try:
+            rebuild_employee_summaries(db, pending)
+        except Exception:
+            _mark_stale(db, pending)
+
+
+def _refresh_on_write(db: Session, entry: Employee, previous: Optional[dict]):
+    current = tuple(getattr(entry, key) for key in GROUP_KEYS)
+    before = current
+    if previous:
+        before = tuple(previous.get(key, value) for key, value in zip(GROUP_KEYS, current))
+    try:
+        refresh_summary_group(db, *current)
+        if before != current:
+            refresh_summary_group(db, *before)
+    except Exception:
+        _mark_stale(db, {current[0], before[0]})
+    _repair_stale(db)
+
+
+def _rebuild_on_bulk_write(db: Session, organization_ids: set):
+    try:
+        rebuild_employee_summaries(db, organization_ids)
+    except Exception:
+        _mark_stale(db, organization_ids)
+    _repair_stale(db)
+
+
+# ---- answering aggregate queries -------------------------------------------
+
+def _summary_aggregate(field: str, agg_func: str):
+    """The summary expression equivalent to agg_func(Employee.<field>), or None if there is none."""
+    if agg_func == "count":
+        if field == "salary":
+            return func.coalesce(func.sum(EmployeeSummary.salary_count), 0)
+        column = Employee.__table__.c.get(field)
+        # COUNT(column) equals the headcount only for columns that are never NULL
+        if column is not None and not column.nullable:
+            return func.coalesce(func.sum(EmployeeSummary.headcount), 0)
+        return None
+    if field != "salary":
+        return None
+    return {
+        "sum": lambda: func.sum(EmployeeSummary.salary_sum),
+        "avg": lambda: func.sum(EmployeeSummary.salary_sum) / func.nullif(func.sum(EmployeeSummary.salary_count), 0),
+        "min": lambda: func.min(EmployeeSummary.salary_min),
+        "max": lambda: func.max(EmployeeSummary.salary_max),
+    }.get(agg_func, lambda: None)()
+
+
+def answer_from_summary(db: Session, filter_data=None, exclude_data=None, join_model=None, aggregate_data=None,
+                        group_by=None, order_by=None, skip=0, limit=None, fetch_one=False):
+    """
+    Aggregate source for fetch_model_entries_sync: answers Employee aggregate queries whose
+    filters and groups only use the summary keys, with the same result labels
+    (`<field>_<func>`). Returns None for anything else.
+    """
+    if not EMPLOYEE_SUMMARY_ENABLED or join_model or exclude_data:
+        return None
+    filter_data, group_by, order_by = filter_data or {}, group_by or [], order_by or []
+    if any((key[:-4] if key.endswith("__in") else key) not in GROUP_KEYS for key in filter_data):
+        return None
+    if any(field not in GROUP_KEYS for field in group_by):
+        return None
+    if any(field.lstrip("-") not in group_by for field in order_by):
+        return None
+
+    organization_filter = filter_data.get("organization_id", filter_data.get("organization_id__in"))
+    if stale_organizations:
+        if organization_filter is None:
+            return None
+        organizations = organization_filter if isinstance(organization_filter, (list, tuple, set)) else [organization_filter]
+        if stale_organizations.intersection(organizations):
+            return None
+
+    if "status" not in filter_data and "status__in" not in filter_data:
+        # Employees without a status are missing from the summaries; answer from employees if any
+        # match. employee_summary_gaps is small (usually empty) and keyed by the remaining filters.
+        unsummarized = db.query(EmployeeSummaryGap.organization_id)
+        for key, value in filter_data.items():
+            column = getattr(EmployeeSummaryGap, key[:-4] if key.endswith("__in") else key)
+            unsummarized = unsummarized.filter(column.in_(value) if key.endswith("__in") else column == value)
+        if unsummarized.first() is not None:
+            return None
+
+    columns = []
+    for field, agg_func in aggregate_data.items():
+        expression = _summary_aggregate(field, agg_func)
+        if expression is None:
+            return None
+        columns.append(expression.label(f"{field}_{agg_func}"))
+
+    query = db.query(*columns).select_from(EmployeeSummary)
+    for key, value in filter_data.items():
+        if key.endswith("__in"):
+            query = query.filter(getattr(EmployeeSummary, key[:-4]).in_(value))
+        else:
+            query = query.filter(getattr(EmployeeSummary, key) == value)
+    if group_by:
+        query = query.group_by(*[getattr(EmployeeSummary, field) for field in group_by])
+    if order_by:
+        query = query.order_by(*[
+            getattr(EmployeeSummary, field[1:]).desc() if field.startswith("-") else getattr(EmployeeSummary, field).asc()
+            for field in order_by
+        ])
+    if skip:
+        query = query.offset(skip)
+    if limit:
+        query = query.limit(limit)
+    return query.first() if fetch_one else query.all()
+
+
+register_write_hook(Employee, _refresh_on_write)
+register_bulk_write_hook(Employee, _rebuild_on_bulk_write)
+register_aggregate_source(Employee, answer_from_summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute summaries from employees")
+    parser.add_argument("--organization-id", type=int, nargs="+", help="limit the rebuild to these organizations")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.error("nothing to do; pass --rebuild")
+
+    from app.db import SessionLocal
+    db = SessionLocal()
+    try:
+        written = rebuild_employee_summaries(db, args.organization_id)
+        print(f"Rebuilt {written} employee summary rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import logging
+import os
+from typing import Dict, List
+
+from dotenv import load_dotenv
+from sqlalchemy import String, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Employee
+from app.schema.employee_search_schema import FacetField
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FACET_MAX_VALUES = int(os.getenv("FACET_MAX_VALUES", 100))  # values returned per facet, by count
+
+FACET_COLUMNS = {
+    FacetField.DEPARTMENT: Employee.department,
+    FacetField.LOCATION: Employee.location,
+    FacetField.POSITION: Employee.position,
+    FacetField.STATUS: Employee.status,
+}
+
+
+def _grouping_sets_counts(db: Session, filters: List, facets: List[FacetField]) -> List[tuple]:
+    """PostgreSQL: one scan, GROUP BY GROUPING SETS ((department), (location), ...)."""
+    columns = [FACET_COLUMNS[facet] for facet in facets]
+    statement = (
+        select(*columns, *[func.grouping(column) for column in columns], func.count())
+        .where(*filters)
+        .group_by(func.grouping_sets(*columns))
+    )
+    rows = []
+    for row in db.execute(statement):
+        values, flags, count = row[:len(facets)], row[len(facets):-1], row[-1]
+        # grouping() is 0 for the column the row was grouped by
+        index = flags.index(0)
+        rows.append((facets[index].value, values[index], count))
+    return rows
+
+
+def _union_counts(db: Session, filters: List, facets: List[FacetField]) -> List[tuple]:
+    """Other databases: one statement of UNION ALL'd GROUP BYs."""
+    statement = union_all(*[
+        select(literal(facet.value).label("facet"), cast(FACET_COLUMNS[facet], String).label("value"),
+               func.count().label("count"))
+        .where(*filters)
+        .group_by(FACET_COLUMNS[facet])
+        for facet in facets
+    ])
+    return [tuple(row) for row in db.execute(statement)]
+
+
+def compute_facets(db: Session, filters: List, facets: List[FacetField]) -> Dict[str, List[Dict]]:
+    """
+    Counts of matching employees per value of each requested facet, in one round-trip.
+    :param db: SQLAlchemy session
+    :param filters: Search criteria, as returned by build_search_filters
+    :param facets: Fields to group by
+    :return: {"department": [{"value": "Engineering", "count": 12}, ...], ...}, most frequent first
+    """
+    if not facets:
+        return {}
+    if db.get_bind().dialect.name == "postgresql" and len(facets) > 1:
+        rows = _grouping_sets_counts(db, filters, facets)
+    else:
+        rows = _union_counts(db, filters, facets)
+
+    result = {facet.value: [] for facet in facets}
+    for facet, value, count in rows:
+        result[facet].append({"value": getattr(value, "value", value), "count": count})
+    for facet, values in result.items():
+        values.sort(key=lambda item: (-item["count"], str(item["value"])))
+        del values[FACET_MAX_VALUES:]
+    return result
@@ -0,0 +1,83 @@
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db import async_engine, engine, register_pool_checkout_listener, replica_set
+from app.services.search_cache_service import search_cache_stats
+from app.services.search_log_writer import search_log_writer
+from app.utils.metrics import observe_pool_checkout, record_pool_connection_event
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+class RuntimeStatsCollector:
+    """
+    Exposes the in-process stats of the search cache and the search log writer.
+    In multi-process mode these describe the worker that served the scrape.
+    """
+
+    def collect(self):
+        cache = search_cache_stats()
+        hit_ratio = GaugeMetricFamily("search_cache_hit_ratio", "Search response cache hit ratio of this process")
+        hit_ratio.add_metric([], cache["hit_ratio"])
+        yield hit_ratio
+
+        writer = search_log_writer.stats()
+        queue = GaugeMetricFamily("search_log_queue", "Search log writer queue", labels=["field"])
+        queue.add_metric(["depth"], writer["queue_depth"])
+        queue.add_metric(["capacity"], writer["queue_capacity"])
+        yield queue
+        records = GaugeMetricFamily("search_log_records", "Search log records by outcome since start",
+                                    labels=["outcome"])
+        for outcome in ("enqueued", "flushed", "dropped", "spilled"):
+            records.add_metric([outcome], writer[outcome])
+        yield records
+        flush = GaugeMetricFamily("search_log_flush_ms", "Search log batch flush duration", labels=["stat"])
+        for stat in ("last", "max", "avg"):
+            flush.add_metric([stat], writer[f"{stat}_flush_ms"])
+        yield flush
+
+
+def instrument_pool(pooled_engine: Engine, label: str) -> None:
+    """Label the engine's pool in metrics and count its connection churn."""
+    pooled_engine.pool.metrics_label = label
+    for pool_event, name in (("connect", "opened"), ("close", "closed"), ("close_detached", "closed"),
+                             ("invalidate", "invalidated")):
+        event.listen(pooled_engine, pool_event,
+                     lambda *args, name=name: record_pool_connection_event(pooled_engine.pool, name))
+
+
+register_pool_checkout_listener(observe_pool_checkout)
+instrument_pool(engine, "primary")
+if async_engine is not None:
+    instrument_pool(async_engine.sync_engine, "primary_async")
+for index, replica in enumerate(replica_set.engines if replica_set is not None else []):
+    instrument_pool(replica, f"replica_{index}")
+
+runtime_stats_collector = RuntimeStatsCollector()
+if not PROMETHEUS_MULTIPROC_DIR:
+    REGISTRY.register(runtime_stats_collector)
+
+
+def render_metrics():
+    """
+    Metrics in the Prometheus text format.
+    :return: (body, content type)
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Aggregate every worker's metric files; a fresh registry per scrape as required
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(runtime_stats_collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Clean up a finished worker's live metric files (multi-process mode only)."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
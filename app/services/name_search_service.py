@@ -0,0 +1,95 @@
+import logging
+from typing import List, Tuple
+
+from sqlalchemy import case, event, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models import Employee
+
+logger = logging.getLogger(__name__)
+
+# SQLite FTS5 shadow table mirroring employees.name (trigram tokenizer => substring search)
+SQLITE_NAME_FTS_TABLE = "employees_name_fts"
+
+# Trigram indexes cannot serve patterns shorter than one trigram
+MIN_TRIGRAM_LENGTH = 3
+
+SQLITE_NAME_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_NAME_FTS_TABLE} "
+    f"USING fts5(name, content='employees', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS employees_name_fts_ai AFTER INSERT ON employees BEGIN "
+    f"INSERT INTO {SQLITE_NAME_FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS employees_name_fts_ad AFTER DELETE ON employees BEGIN "
+    f"INSERT INTO {SQLITE_NAME_FTS_TABLE}({SQLITE_NAME_FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS employees_name_fts_au AFTER UPDATE OF name ON employees BEGIN "
+    f"INSERT INTO {SQLITE_NAME_FTS_TABLE}({SQLITE_NAME_FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); "
+    f"INSERT INTO {SQLITE_NAME_FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+    f"INSERT INTO {SQLITE_NAME_FTS_TABLE}({SQLITE_NAME_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+# Per-engine memo of whether the SQLite shadow table exists
+_fts_available = {}
+
+
+def create_sqlite_name_index(connection: Connection):
+    """Create (or rebuild) the FTS5 shadow table and its sync triggers on SQLite."""
+    for statement in SQLITE_NAME_FTS_DDL:
+        connection.execute(text(statement))
+    _fts_available.clear()
+
+
+def drop_sqlite_name_index(connection: Connection):
+    """Remove the FTS5 shadow table and its triggers."""
+    for trigger in ("employees_name_fts_ai", "employees_name_fts_ad", "employees_name_fts_au"):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {SQLITE_NAME_FTS_TABLE}"))
+    _fts_available.clear()
+
+
+def _sqlite_fts_available(bind: Engine) -> bool:
+    key = str(bind.url)
+    if key not in _fts_available:
+        _fts_available[key] = inspect(bind).has_table(SQLITE_NAME_FTS_TABLE)
+    return _fts_available[key]
+
+
+def _like_pattern(name: str) -> str:
+    escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_name_search(db: Session, name: str) -> Tuple[object, List[object]]:
+    """
+    Build the name filter and a relevance ordering for the current database.
+
+    PostgreSQL: ILIKE served by the pg_trgm GIN index, ranked by prefix match then similarity().
+    SQLite: MATCH against the FTS5 trigram shadow table when it exists.
+    Anything else, or patterns shorter than a trigram: plain ILIKE.
+
+    :return: (filter criterion, list of ORDER BY expressions, most relevant first)
+    """
+    bind = db.get_bind()
+    dialect = bind.dialect.name
+    pattern = _like_pattern(name)
+    prefix_rank = case((Employee.name.ilike(pattern[1:], escape="\\"), 1), else_=0).desc()
+
+    if dialect == "postgresql":
+        criterion = Employee.name.ilike(pattern, escape="\\")
+        return criterion, [prefix_rank, func.similarity(Employee.name, name).desc()]
+
+    if dialect == "sqlite" and len(name) >= MIN_TRIGRAM_LENGTH and _sqlite_fts_available(bind):
+        phrase = '"' + name.replace('"', '""') + '"'
+        matches = select(text("rowid")).select_from(text(SQLITE_NAME_FTS_TABLE)).where(
+            text(f"{SQLITE_NAME_FTS_TABLE} MATCH :name_phrase").bindparams(name_phrase=phrase)
+        )
+        return Employee.id.in_(matches), [prefix_rank, func.length(Employee.name)]
+
+    return Employee.name.ilike(pattern, escape="\\"), [prefix_rank, func.length(Employee.name)]
+
+
+@event.listens_for(Employee.__table__, "after_create")
+def _create_sqlite_name_index_after_create(target, connection, **kw):
+    # Keep metadata.create_all() deployments (dev/test SQLite) on the FTS5 path too
+    if connection.dialect.name == "sqlite":
+        create_sqlite_name_index(connection)
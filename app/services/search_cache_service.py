@@ -0,0 +1,106 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.schema.employee_search_schema import EmployeeSearchRequest
+from app.services.data_version_service import get_data_version
+from app.utils.cache_utils import RedisCache, TTLCache
+from app.utils.http_cache_utils import make_etag
+from app.utils.metrics import record_cache_lookup
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "memory")  # memory | redis
+SEARCH_CACHE_REDIS_URL = os.getenv("SEARCH_CACHE_REDIS_URL", "redis://localhost:6379/0")
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", 30))  # seconds
+SEARCH_CACHE_MAX_SIZE = int(os.getenv("SEARCH_CACHE_MAX_SIZE", 5000))  # memory backend only
+# HTTP caching of search responses (ETag / Cache-Control)
+SEARCH_CACHE_CONTROL = os.getenv("SEARCH_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+# ETags also roll over every N seconds, bounding staleness from writes that bypass the CRUD layer
+SEARCH_ETAG_MAX_AGE = int(os.getenv("SEARCH_ETAG_MAX_AGE", 300))
+
+
+def build_search_cache():
+    if SEARCH_CACHE_BACKEND == "redis":
+        return RedisCache.from_url(SEARCH_CACHE_REDIS_URL, prefix="search", ttl=SEARCH_CACHE_TTL)
+    if SEARCH_CACHE_BACKEND == "memory":
+        return TTLCache(max_size=SEARCH_CACHE_MAX_SIZE, ttl=SEARCH_CACHE_TTL)
+    raise ValueError(f"Unknown SEARCH_CACHE_BACKEND '{SEARCH_CACHE_BACKEND}'")
+
+
+search_cache = build_search_cache()
+
+_stats_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def normalized_request(filter_data: EmployeeSearchRequest) -> str:
+    """
+    Canonical JSON form of a search request. It is built from the validated request the
+    query runs with (blank filters are already None), never from values the query ignores.
+    """
+    return json.dumps(filter_data.model_dump(mode="json"), sort_keys=True)
+
+
+def search_cache_key(filter_data: EmployeeSearchRequest) -> str:
+    """
+    Cache key for a search. It embeds the organization's data version, which every
+    employee or column-config write through the CRUD layer bumps, so stale entries are
+    never read again and simply age out.
+    """
+    digest = hashlib.sha1(normalized_request(filter_data).encode()).hexdigest()
+    return f"{filter_data.organization_id}:{get_data_version(filter_data.organization_id)}:{digest}"
+
+
+def search_etag(filter_data: EmployeeSearchRequest) -> str:
+    """
+    Strong ETag for a search response, computed without querying employees: it only
+    depends on the organization's data version and the request the query runs with.
+    It is stable across workers and restarts only with DATA_VERSION_BACKEND=redis.
+    """
+    epoch = int(time.time() // SEARCH_ETAG_MAX_AGE)
+    return make_etag(get_data_version(filter_data.organization_id), str(epoch), normalized_request(filter_data))
+
+
+def get_cached_search(key: str) -> Optional[Dict]:
+    global _hits, _misses
+    try:
+        response = search_cache.get(key)
+    except Exception:
+        logger.exception("Search cache lookup failed")
+        response = None
+    with _stats_lock:
+        if response is None:
+            _misses += 1
+        else:
+            _hits += 1
+    record_cache_lookup("search", response is not None)
+    return response
+
+
+def store_cached_search(key: str, response: Dict) -> None:
+    try:
+        search_cache.set(key, response)
+    except Exception:
+        logger.exception("Search cache store failed")
+
+
+def search_cache_stats() -> Dict:
+    lookups = _hits + _misses
+    return {
+        "enabled": SEARCH_CACHE_ENABLED,
+        "backend": SEARCH_CACHE_BACKEND,
+        "hits": _hits,
+        "misses": _misses,
+        "hit_ratio": round(_hits / lookups, 4) if lookups else 0.0,
+    }
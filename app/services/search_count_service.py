@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import register_bulk_write_hook, register_write_hook
+from app.models import Employee
+from app.schema.employee_search_schema import CountStrategy, EmployeeSearchRequest
+from app.services.data_version_service import get_data_version
+from app.utils.cache_utils import TTLCache
+from app.utils.metrics import record_cache_lookup
+from app.utils.sql_utils import Explain
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", 60))  # seconds
+COUNT_CACHE_MAX_SIZE = int(os.getenv("COUNT_CACHE_MAX_SIZE", 10000))
+
+# Keys are (organization_id, data version, filter hash): a write in another worker bumps the
+# shared version, so counts cached here before it are no longer looked up
+count_cache = TTLCache(max_size=COUNT_CACHE_MAX_SIZE, ttl=COUNT_CACHE_TTL)
+
+# Request fields that affect the number of matching rows
+COUNT_FILTER_FIELDS = ("name", "department", "position", "location", "status")
+
+
+def filter_hash(filter_data: EmployeeSearchRequest) -> str:
+    """Stable hash of the filters that determine the result set size."""
+    filters = {field: getattr(filter_data, field) for field in COUNT_FILTER_FIELDS}
+    return hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def estimate_count(db: Session, query) -> Optional[int]:
+    """
+    Return the planner's row estimate for the query, or None when the database
+    does not provide one (only PostgreSQL is supported).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    plan = db.execute(Explain(query.statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_matches(db: Session, query, filter_data: EmployeeSearchRequest) -> Tuple[Optional[int], str]:
+    """
+    Compute the total number of rows matching the search according to its count strategy.
+    :return: (total or None, the strategy actually used)
+    """
+    strategy = filter_data.count_strategy
+
+    if strategy == CountStrategy.NONE:
+        return None, strategy.value
+
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = estimate_count(db, query)
+        if estimate is not None:
+            return estimate, strategy.value
+        return query.count(), CountStrategy.EXACT.value
+
+    if strategy == CountStrategy.CACHED:
+        organization_id = filter_data.organization_id
+        key = (organization_id, get_data_version(organization_id), filter_hash(filter_data))
+        total = count_cache.get(key)
+        record_cache_lookup("count", total is not None)
+        if total is None:
+            total = query.count()
+            count_cache.set(key, total)
+        return total, strategy.value
+
+    return query.count(), CountStrategy.EXACT.value
+
+
+def invalidate_organization_counts(organization_id: int) -> int:
+    """Drop every cached count for the organization."""
+    return count_cache.delete_where(lambda key: key[0] == organization_id)
+
+
+def _invalidate_counts_on_employee_write(db: Session, entry: Employee, previous: Optional[dict]):
+    invalidate_organization_counts(entry.organization_id)
+    if previous and previous.get("organization_id") not in (None, entry.organization_id):
+        invalidate_organization_counts(previous["organization_id"])
+
+
+def _invalidate_counts_on_bulk_write(db: Session, organization_ids: set):
+    for organization_id in organization_ids:
+        invalidate_organization_counts(organization_id)
+
+
+register_write_hook(Employee, _invalidate_counts_on_employee_write)
+register_bulk_write_hook(Employee, _invalidate_counts_on_bulk_write)
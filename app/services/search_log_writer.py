@@ -0,0 +1,237 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.db import SessionLocal, engine
+from app.models import SearchLog
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SEARCH_LOG_QUEUE_SIZE = int(os.getenv("SEARCH_LOG_QUEUE_SIZE", 10000))  # max pending records
+SEARCH_LOG_BATCH_SIZE = int(os.getenv("SEARCH_LOG_BATCH_SIZE", 500))  # flush every N records
+SEARCH_LOG_FLUSH_INTERVAL_MS = int(os.getenv("SEARCH_LOG_FLUSH_INTERVAL_MS", 200))  # or every M ms
+# What to do when the queue is full: block (wait up to SEARCH_LOG_BLOCK_TIMEOUT_MS, then drop),
+# drop (discard the record) or spill (append it to SEARCH_LOG_SPILL_PATH for later replay)
+SEARCH_LOG_OVERFLOW_POLICY = os.getenv("SEARCH_LOG_OVERFLOW_POLICY", "drop")
+SEARCH_LOG_BLOCK_TIMEOUT_MS = int(os.getenv("SEARCH_LOG_BLOCK_TIMEOUT_MS", 50))
+SEARCH_LOG_SPILL_PATH = os.getenv("SEARCH_LOG_SPILL_PATH", "search_log_spill.jsonl")
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+
+def writer_session_factory() -> Callable:
+    """
+    Sessions for the writer thread. A StaticPool engine (SQLite) has a single connection
+    shared with request sessions, so the writer opens its own connections to the file.
+    """
+    if isinstance(engine.pool, StaticPool) and engine.url.database not in (None, "", ":memory:"):
+        own_engine = create_engine(engine.url, connect_args={"check_same_thread": False}, poolclass=NullPool)
+        return sessionmaker(autocommit=False, autoflush=False, bind=own_engine)
+    return SessionLocal
+
+
+class SearchLogWriter:
+    """
+    Buffers SearchLog records in a bounded queue and writes them from a background
+    thread with one multi-row INSERT per batch, keeping the audit write off the
+    request path.
+    """
+
+    def __init__(
+            self,
+            session_factory: Optional[Callable] = None,
+            queue_size: int = SEARCH_LOG_QUEUE_SIZE,
+            batch_size: int = SEARCH_LOG_BATCH_SIZE,
+            flush_interval_ms: int = SEARCH_LOG_FLUSH_INTERVAL_MS,
+            overflow_policy: str = SEARCH_LOG_OVERFLOW_POLICY,
+            block_timeout_ms: int = SEARCH_LOG_BLOCK_TIMEOUT_MS,
+            spill_path: str = SEARCH_LOG_SPILL_PATH,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown search log overflow policy '{overflow_policy}'")
+        self.session_factory = session_factory or writer_session_factory()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout_ms / 1000
+        self.spill_path = spill_path
+
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._atexit_registered = False
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.flushed = 0
+        self.flush_failures = 0
+        self.flush_count = 0
+        self.flush_seconds_total = 0.0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    # ---- producer side -------------------------------------------------
+
+    def enqueue(self, record: Dict) -> bool:
+        """
+        Queue a SearchLog record (a dict of column values).
+        :return: True if queued, False if it was dropped or spilled because the queue is full
+        """
+        self.start()
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            self.enqueued += 1
+            return True
+        except queue.Full:
+            if self.overflow_policy == "spill":
+                self._spill([record])
+            else:
+                self.dropped += 1
+                logger.warning("Search log queue full; dropping audit record")
+            return False
+
+    # ---- lifecycle -----------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="search-log-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued and stop the worker thread."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        # Anything enqueued after the worker exited
+        self._drain_and_flush()
+
+    # ---- consumer side -------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+        self._drain_and_flush()
+
+    def _collect_batch(self) -> List[Dict]:
+        """Wait for the first record, then gather more until the batch is full or the interval elapses."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain_and_flush(self) -> None:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: List[Dict]) -> None:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(SearchLog), batch)
+            db.commit()
+            self.flushed += len(batch)
+        except Exception:
+            db.rollback()
+            self.flush_failures += 1
+            logger.exception(f"Failed to write {len(batch)} search log records")
+            if self.overflow_policy == "spill":
+                self._spill(batch)
+            else:
+                self.dropped += len(batch)
+        finally:
+            db.close()
+            elapsed = time.perf_counter() - started
+            self.flush_count += 1
+            self.flush_seconds_total += elapsed
+            self.last_flush_ms = round(elapsed * 1000, 2)
+            self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+    # ---- spill file ------------------------------------------------------
+
+    def _spill(self, records: List[Dict]) -> None:
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as spill_file:
+                for record in records:
+                    spill_file.write(json.dumps(record, default=str) + "\n")
+        self.spilled += len(records)
+
+    def replay_spill(self) -> int:
+        """Re-queue records spilled to disk by an earlier overflow; returns how many were read."""
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return 0
+            with open(self.spill_path, encoding="utf-8") as spill_file:
+                records = [json.loads(line) for line in spill_file if line.strip()]
+            os.remove(self.spill_path)
+        for record in records:
+            self.enqueue(record)
+        return len(records)
+
+    # ---- metrics ---------------------------------------------------------
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "flush_failures": self.flush_failures,
+            "flush_count": self.flush_count,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "avg_flush_ms": round(self.flush_seconds_total / self.flush_count * 1000, 2) if self.flush_count else 0.0,
+        }
+
+
+# Process-wide writer used by the search endpoint
+search_log_writer = SearchLogWriter()
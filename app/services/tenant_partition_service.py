@@ -0,0 +1,51 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.db_crud_operation import register_write_hook
+from app.models import Organization
+
+logger = logging.getLogger(__name__)
+
+
+def employees_partition_strategy(db: Session) -> Optional[str]:
+    """
+    Return 'hash' or 'list' when employees is a partitioned PostgreSQL table, else None.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    strategy = db.execute(text(
+        "SELECT pt.partstrat FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'employees'"
+    )).scalar()
+    return {"h": "hash", "l": "list"}.get(strategy)
+
+
+def ensure_organization_partition(db: Session, organization_id: int) -> bool:
+    """
+    Give an organization its own partition when employees is LIST-partitioned.
+    Organizations without one live in the DEFAULT partition; HASH partitioning needs no action.
+    :return: True if a partition was created
+    """
+    if employees_partition_strategy(db) != "list":
+        return False
+
+    partition = f"employees_p_org_{int(organization_id)}"
+    exists = db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition}).scalar()
+    if exists:
+        return False
+
+    db.execute(text(f"CREATE TABLE {partition} PARTITION OF employees FOR VALUES IN ({int(organization_id)})"))
+    db.commit()
+    logger.info(f"Created employees partition {partition}")
+    return True
+
+
+def _create_partition_for_new_organization(db: Session, entry: Organization, previous: Optional[dict]):
+    if previous is None:
+        ensure_organization_partition(db, entry.id)
+
+
+register_write_hook(Organization, _create_partition_for_new_organization)
@@ -0,0 +1,191 @@
+"""
+Synthetic data generator for load and capacity testing.
+
+    python -m app.synthetic_data --organizations 100 --employees 100000 --seed 42
+
+Generates N organizations x M employees with weighted department, location and status
+distributions and a varied column configuration per organization. The same seed always
+produces the same dataset. Rows are written in batches: COPY on PostgreSQL, multi-row
+INSERTs elsewhere. Uses DATABASE_URL unless --database-url is given; tables must exist.
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models import Employee, EmployeeStatus, Organization, OrganizationColumnConfig
+from app.services.employee_summary_service import rebuild_employee_summaries
+
+# (value, weight) pairs; weights roughly follow a mid-size company's headcount
+DEPARTMENTS = [("Engineering", 30), ("Sales", 18), ("Support", 14), ("Marketing", 9), ("Product", 8),
+               ("Finance", 7), ("Operations", 6), ("HR", 4), ("Legal", 2), ("Design", 2)]
+POSITIONS = [("Engineer", 28), ("Specialist", 20), ("Analyst", 16), ("Associate", 12), ("Manager", 12),
+             ("Designer", 5), ("Director", 4), ("Vice President", 2), ("Intern", 1)]
+LOCATIONS = [("New York", 20), ("San Francisco", 15), ("Remote", 15), ("Chicago", 10), ("Austin", 9),
+             ("Seattle", 8), ("Boston", 7), ("Denver", 6), ("London", 5), ("Berlin", 5)]
+STATUSES = [(EmployeeStatus.ACTIVE, 82), (EmployeeStatus.NOT_STARTED, 6), (EmployeeStatus.TERMINATED, 12)]
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+               "Carlos", "Maria", "Wei", "Priya", "Ahmed", "Fatima", "Hiroshi", "Yuki", "Olga", "Ivan"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore",
+              "Jackson", "Lee", "Chen", "Patel", "Khan", "Tanaka", "Ivanova", "Nguyen", "Kim", "Singh"]
+
+# Column configuration presets an organization can pick from (mirrors seed_data.py)
+COLUMN_PRESETS = [
+    ["name", "email", "department", "position", "location"],
+    ["name", "department", "location", "position"],
+    ["name", "email", "phone", "department", "position", "location", "hire_date"],
+    ["name", "position", "status"],
+    ["name", "email", "department", "location", "hire_date", "status"],
+]
+HIDDEN_COLUMN_CANDIDATES = ["phone", "salary", "hire_date", "status"]
+
+EMPLOYEE_COLUMNS = ("name", "email", "phone", "department", "position", "location",
+                    "hire_date", "salary", "organization_id", "status")
+
+
+def _sample(rng: random.Random, choices, k: int) -> list:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=k)
+
+
+def generate_employees(rng: random.Random, organization_id: int, count: int) -> Iterator[Dict]:
+    """Yield `count` employee rows for one organization; emails are unique within it."""
+    departments = _sample(rng, DEPARTMENTS, count)
+    positions = _sample(rng, POSITIONS, count)
+    locations = _sample(rng, LOCATIONS, count)
+    statuses = _sample(rng, STATUSES, count)
+    start = date(2010, 1, 1)
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@org{organization_id}.example.com",
+            "phone": f"+1-555-{rng.randrange(10000):04d}" if rng.random() < 0.7 else None,
+            "department": departments[i],
+            "position": positions[i],
+            "location": locations[i],
+            "hire_date": start + timedelta(days=rng.randrange(5800)),
+            "salary": float(rng.randrange(35000, 250000, 500)),
+            "organization_id": organization_id,
+            "status": statuses[i],
+        }
+
+
+def generate_column_configs(rng: random.Random, organization_id: int) -> List[Dict]:
+    """A preset column layout, sometimes with an extra hidden column."""
+    columns = list(rng.choice(COLUMN_PRESETS))
+    configs = [
+        {"organization_id": organization_id, "column_name": name, "display_order": order, "is_visible": 1}
+        for order, name in enumerate(columns, start=1)
+    ]
+    hidden = [name for name in HIDDEN_COLUMN_CANDIDATES if name not in columns]
+    if hidden and rng.random() < 0.5:
+        configs.append({"organization_id": organization_id, "column_name": rng.choice(hidden),
+                        "display_order": len(columns) + 1, "is_visible": 0})
+    return configs
+
+
+def _copy_employees(engine: Engine, rows: List[Dict]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[name] is None else getattr(row[name], "value", row[name])
+                         for name in EMPLOYEE_COLUMNS])
+    buffer.seek(0)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.copy_expert(f"COPY employees ({', '.join(EMPLOYEE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _insert_employees(engine: Engine, rows: List[Dict]) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), rows)
+
+
+def load_synthetic_data(engine: Engine, organizations: int, employees_per_organization: int,
+                        seed: int = 42, batch_size: int = 10000) -> Dict:
+    """
+    Generate and write a reproducible dataset.
+    :param engine: SQLAlchemy engine of a database whose tables already exist
+    :param organizations: Number of organizations to create
+    :param employees_per_organization: Employees generated for each organization
+    :param seed: Random seed; the same seed yields the same rows
+    :param batch_size: Employees written per COPY / INSERT batch
+    :return: Counts, the new organization ids, elapsed seconds and rows/sec
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    write_employees = _copy_employees if engine.dialect.name == "postgresql" else _insert_employees
+
+    with engine.begin() as conn:
+        organization_ids = list(conn.execute(
+            insert(Organization).returning(Organization.id, sort_by_parameter_order=True),
+            [{"name": f"Synthetic Org {seed}-{i}", "description": "Generated for load testing"}
+             for i in range(1, organizations + 1)],
+        ).scalars())
+        conn.execute(insert(OrganizationColumnConfig), [
+            config for organization_id in organization_ids
+            for config in generate_column_configs(rng, organization_id)
+        ])
+
+    batch = []
+    for organization_id in organization_ids:
+        for row in generate_employees(rng, organization_id, employees_per_organization):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                write_employees(engine, batch)
+                batch = []
+    if batch:
+        write_employees(engine, batch)
+
+    with Session(engine) as db:
+        rebuild_employee_summaries(db, organization_ids)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    elapsed = time.perf_counter() - started
+    employees = organizations * employees_per_organization
+    return {
+        "organizations": organizations,
+        "employees": employees,
+        "organization_ids": organization_ids,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(employees / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--organizations", type=int, default=10)
+    parser.add_argument("--employees", type=int, default=1000, help="employees per organization")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db import engine
+    result = load_synthetic_data(engine, args.organizations, args.employees, args.seed, args.batch_size)
+    print(f"Created {result['organizations']} organizations and {result['employees']} employees "
+          f"in {result['seconds']}s ({result['rows_per_second']} rows/sec); "
+          f"organization ids {result['organization_ids'][0]}-{result['organization_ids'][-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,11 @@ from typing import Any
 
 import jwt
 from fastapi import HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from jose.exceptions import JWTError
+from pydantic import ValidationError as SchemaValidationError
 from pydantic.v1 import ValidationError
 from sqlalchemy.orm import Session
 
@@ -15,6 +19,41 @@ from sqlalchemy.orm import Session
 # Initialize logger
 logger = logging.getLogger('fastapi')
 
+# 422 messages keep the wording API clients already match on (pydantic v1), by error type
+VALIDATION_MESSAGES = {
+    "missing": "field required",
+    "enum": "value is not a valid enumeration member; permitted: {expected}",
+    "int_parsing": "value is not a valid integer",
+    "int_type": "value is not a valid integer",
+    "float_parsing": "value is not a valid float",
+    "bool_parsing": "value could not be parsed to a boolean",
+    "greater_than": "ensure this value is greater than {gt}",
+    "greater_than_equal": "ensure this value is greater than or equal to {ge}",
+    "less_than": "ensure this value is less than {lt}",
+    "less_than_equal": "ensure this value is less than or equal to {le}",
+}
+
+
+def validation_error_response(ex: SchemaValidationError) -> ORJSONResponse:
+    """422 response for a request that fails its (pydantic v2) schema."""
+    detail = jsonable_encoder(ex.errors())
+    for error in detail:
+        template = VALIDATION_MESSAGES.get(error.get("type"))
+        if template:
+            context = {key: str(value).replace(" or ", ", ") for key, value in (error.get("ctx") or {}).items()}
+            try:
+                error["msg"] = template.format(**context)
+            except KeyError:
+                pass
+    return ORJSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={
+            "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "error": str(ex),
+            "detail": detail,
+        },
+    )
+
 def handle_api_request(
         request: Request,
         db: Session ,  # Add db as a parameter
@@ -95,6 +134,11 @@ def handle_api_request(
             "error": str(e)
             }
 
+    except SchemaValidationError as ex:
+        # Request schemas are pydantic v2 models
+        logger.warning(f"Validation error: {ex}")
+        return validation_error_response(ex)
+
 
     except Exception as ex:
         e = ex
@@ -106,6 +150,83 @@ def handle_api_request(
             }
 
 
+async def handle_api_request_async(
+        request: Request,
+        db: Any,
+        schema=None,
+        query_schema=None,
+        helper_function=None,
+        *helper_args: Any,
+        **helper_kwargs: Any
+):
+    """
+    Async counterpart of handle_api_request for `async def` routes.
+
+    Coroutine helpers (e.g. those taking an AsyncSession) are awaited on the event loop;
+    plain helpers are run in the threadpool so they never block it.
+
+    Args:
+        request: The incoming FastAPI request object.
+        db: The database session for the request (Session or AsyncSession).
+        schema: Pydantic model for validating request body (for POST/PUT).
+        query_schema: Pydantic model for validating query params (for GET).
+        helper_function: Function or coroutine function to process the validated data.
+
+    Returns:
+        The helper's response, or an error payload.
+    """
+    async def call_helper(*args, **kwargs):
+        if inspect.iscoroutinefunction(helper_function):
+            return await helper_function(*args, **kwargs)
+        return await run_in_threadpool(helper_function, *args, **kwargs)
+
+    try:
+        logger.info(f"Processing {request.method} request to {request.url}")
+        content_type = request.headers.get("content-type")
+
+        if request.method == "GET":
+            query_params = request.query_params
+            if query_schema:
+                logger.debug("Validating query parameters using schema.")
+                query_model_instance = query_schema(**dict(query_params))
+                return await call_helper(db, query_model_instance, *helper_args, **helper_kwargs)
+            logger.debug(f"Calling helper function with query params: {query_params}")
+            if query_params:
+                return await call_helper(db, dict(query_params), *helper_args, **helper_kwargs)
+            return await call_helper(db, *helper_args, **helper_kwargs)
+
+        elif request.method in ["POST", "PUT", "DELETE"]:
+            parsed_body = await parse_request_body(request, content_type)
+            if schema:
+                logger.debug("Validating request body using schema.")
+                model_instance = schema(**parsed_body)
+                return await call_helper(db, model_instance, *helper_args, **helper_kwargs)
+            return await call_helper(db, parsed_body, *helper_args, **helper_kwargs)
+
+        logger.error(f"Method {request.method} not allowed.")
+        raise HTTPException(status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                            detail="Method not allowed")
+
+    except ValidationError as ex:
+        logger.error(f"Validation error: {ex}")
+        return {
+            "status_code": status.HTTP_400_BAD_REQUEST,
+            "error": str(ex)
+            }
+
+    except SchemaValidationError as ex:
+        # Request schemas are pydantic v2 models
+        logger.warning(f"Validation error: {ex}")
+        return validation_error_response(ex)
+
+    except Exception as ex:
+        logger.exception(f"Unexpected error occurred: {ex}")
+        return {
+            "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "error": str(ex)
+            }
+
+
 # Utility function to parse the request body based on content type
 async def parse_request_body(request: Request, content_type: str):
     if request.query_params:
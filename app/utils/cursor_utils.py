@@ -0,0 +1,57 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Secret used to sign pagination cursors so clients cannot forge sort keys
+CURSOR_SECRET_KEY = os.getenv("CURSOR_SECRET_KEY", "hr-system-cursor-secret").encode()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(CURSOR_SECRET_KEY, payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position into an opaque, signed cursor token.
+    :param data: JSON-serializable dictionary describing the last row's sort key
+    :return: URL-safe cursor string
+    """
+    payload = json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Verify and decode a cursor produced by encode_cursor.
+    :param token: Cursor string received from the client
+    :return: The decoded keyset position
+    :raises ValueError: If the cursor is malformed or its signature does not match
+    """
+    try:
+        payload_part, signature_part = token.split(".", 1)
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except (ValueError, TypeError):
+        raise ValueError("Malformed pagination cursor")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("Invalid pagination cursor signature")
+
+    try:
+        return json.loads(payload)
+    except ValueError:
+        raise ValueError("Malformed pagination cursor")
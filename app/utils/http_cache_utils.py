@@ -0,0 +1,29 @@
+import hashlib
+from typing import Dict, Optional
+
+
+def make_etag(*parts: str) -> str:
+    """Strong ETag (quoted hex digest) derived from the given parts."""
+    digest = hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag. Uses the weak comparison
+    RFC 9110 prescribes for If-None-Match, so W/"x" matches "x".
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_headers(etag: str, cache_control: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.db import engine
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "hr_cache_invalidation")
+INVALIDATION_POLL_SECONDS = float(os.getenv("INVALIDATION_POLL_SECONDS", 5))
+
+# Identifies this process so it can ignore its own notifications
+INSTANCE_ID = uuid.uuid4().hex
+
+_subscribers: Dict[str, List[Callable]] = {}
+_listener_thread = None
+_stop_event = threading.Event()
+
+
+def subscribe(kind: str, callback: Callable):
+    """Register callback(organization_id) for invalidation messages of the given kind."""
+    _subscribers.setdefault(kind, []).append(callback)
+
+
+def _dispatch(kind: str, organization_id):
+    for callback in _subscribers.get(kind, []):
+        try:
+            callback(organization_id)
+        except Exception:
+            logger.exception(f"Invalidation callback {callback.__name__} failed for {kind}")
+
+
+def publish(kind: str, organization_id) -> None:
+    """
+    Tell every other worker to drop cached data of the given kind for an organization.
+    Uses PostgreSQL NOTIFY; on other databases there is nothing to reach, so it is a no-op.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    payload = json.dumps({"kind": kind, "organization_id": organization_id, "source": INSTANCE_ID})
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                         {"channel": INVALIDATION_CHANNEL, "payload": payload})
+            conn.commit()
+    except Exception:
+        logger.exception(f"Failed to publish {kind} invalidation for organization {organization_id}")
+
+
+def _listen_forever():
+    # Dedicated unpooled engine so the long-lived LISTEN connection never occupies a pool slot
+    listen_engine = create_engine(engine.url, poolclass=NullPool)
+    while not _stop_event.is_set():
+        try:
+            raw = listen_engine.raw_connection()
+            try:
+                dbapi_conn = raw.driver_connection
+                dbapi_conn.autocommit = True
+                cursor = dbapi_conn.cursor()
+                cursor.execute(f'LISTEN "{INVALIDATION_CHANNEL}"')
+                logger.info(f"Listening for cache invalidations on '{INVALIDATION_CHANNEL}'")
+                while not _stop_event.is_set():
+                    if select.select([dbapi_conn], [], [], INVALIDATION_POLL_SECONDS) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        notify = dbapi_conn.notifies.pop(0)
+                        message = json.loads(notify.payload)
+                        if message.get("source") != INSTANCE_ID:
+                            _dispatch(message["kind"], message.get("organization_id"))
+            finally:
+                raw.invalidate()
+        except Exception:
+            logger.exception("Invalidation listener failed; reconnecting")
+            _stop_event.wait(INVALIDATION_POLL_SECONDS)
+
+
+def start_listener() -> None:
+    """Start the background LISTEN thread (PostgreSQL only). Safe to call more than once."""
+    global _listener_thread
+    if engine.dialect.name != "postgresql" or (_listener_thread and _listener_thread.is_alive()):
+        return
+    _stop_event.clear()
+    _listener_thread = threading.Thread(target=_listen_forever, name="cache-invalidation-listener", daemon=True)
+    _listener_thread.start()
+
+
+def stop_listener() -> None:
+    _stop_event.set()
+    if _listener_thread:
+        _listener_thread.join(timeout=INVALIDATION_POLL_SECONDS + 1)
@@ -0,0 +1,67 @@
+"""
+Prometheus metrics for the search hot path.
+
+Counters and histograms are multi-process safe: when PROMETHEUS_MULTIPROC_DIR is set
+(required for multi-worker uvicorn/gunicorn) prometheus_client writes them to per-process
+files that app.services.metrics_service aggregates at scrape time.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latency buckets tuned for an API whose requests take milliseconds, not seconds
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=FAST_BUCKETS,
+)
+SEARCH_PHASE_SECONDS = Histogram(
+    "employee_search_phase_seconds",
+    "Time spent in each employee search phase (column_config, count_query, page_query, serialization)",
+    ["phase"], buckets=FAST_BUCKETS,
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a connection from the pool (includes connecting)",
+    ["pool"], buckets=FAST_BUCKETS,
+)
+POOL_SATURATION = Histogram(
+    "db_pool_saturation_ratio", "Checked-out connections / (pool_size + max_overflow), sampled at each checkout",
+    ["pool"], buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
+POOL_OVERFLOW_IN_USE = Gauge(
+    "db_pool_overflow_in_use", "Overflow connections (beyond pool_size) open at the last checkout",
+    ["pool"], multiprocess_mode="livesum",
+)
+POOL_CONNECTION_EVENTS = Counter(
+    "db_pool_connection_events_total",
+    "Pool connection churn: connections opened, closed and invalidated (e.g. failed liveness checks)",
+    ["pool", "event"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by RateLimitMiddleware",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"],
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_pool_checkout(pool, wait_seconds: float) -> None:
+    """Pool checkout listener (registered with app.db.register_pool_checkout_listener)."""
+    label = pool_label(pool)
+    POOL_CHECKOUT_WAIT.labels(label).observe(wait_seconds)
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    if capacity:
+        POOL_SATURATION.labels(label).observe(pool.checkedout() / capacity)
+    POOL_OVERFLOW_IN_USE.labels(label).set(max(pool.overflow(), 0))
+
+
+def pool_label(pool) -> str:
+    """Metric label of a pool: the label given by metrics_service.instrument_pool, or "default"."""
+    return getattr(pool, "metrics_label", "default")
+
+
+def record_pool_connection_event(pool, event: str) -> None:
+    POOL_CONNECTION_EVENTS.labels(pool_label(pool), event).inc()
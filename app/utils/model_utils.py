@@ -1,4 +1,6 @@
 import datetime
+from functools import lru_cache
+from typing import Tuple
 from sqlalchemy.orm import class_mapper
 from enum import Enum
 
@@ -24,3 +26,35 @@ def model_to_dict(model, exclude_fields=None):
     return data
 
 
+@lru_cache(maxsize=512)
+def projected_columns(model, columns: Tuple[str, ...], extra: Tuple[str, ...] = ()) -> Tuple:
+    """
+    Table columns to SELECT for the given output columns plus extra keys (e.g. paging keys).
+    Names that are not columns of the model are skipped; the serializer emits None for them.
+    """
+    table_columns = class_mapper(model).mapped_table.c
+    wanted = list(dict.fromkeys(name for name in columns + extra if name in table_columns))
+    return tuple(table_columns[name] for name in wanted)
+
+
+@lru_cache(maxsize=512)
+def compile_row_serializer(model, columns: Tuple[str, ...], extra: Tuple[str, ...] = ()):
+    """
+    Build a serializer for rows selected with projected_columns(model, columns, extra).
+    Values are passed through untouched (orjson encodes dates, enums and floats natively),
+    so the returned function only picks the visible columns out of the row.
+    """
+    selected = [c.key for c in projected_columns(model, columns, extra)]
+    keys = tuple(columns)
+
+    if list(keys) == selected:
+        # Fast path: the row is exactly the output
+        return lambda row: dict(zip(keys, row))
+
+    positions = {name: index for index, name in enumerate(selected)}
+    getters = tuple(positions.get(name) for name in keys)
+
+    def serialize(row):
+        return {name: None if position is None else row[position] for name, position in zip(keys, getters)}
+
+    return serialize
@@ -0,0 +1,224 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class RateLimitRule(NamedTuple):
+    """`limit` requests per `window` seconds for every distinct key with the given scope."""
+    scope: str
+    limit: int
+    window: int
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int  # seconds until the limit fully resets
+
+
+def parse_rule_map(raw: Optional[str], scope: str) -> Dict[str, RateLimitRule]:
+    """
+    Parse a JSON object of {"<key>": "<limit>/<window seconds>"} into rules,
+    e.g. '{"/api/employees/search": "60/60"}'.
+    """
+    if not raw:
+        return {}
+    rules = {}
+    for key, spec in json.loads(raw).items():
+        limit, window = str(spec).split("/", 1)
+        rules[str(key)] = RateLimitRule(scope=scope, limit=int(limit), window=int(window))
+    return rules
+
+
+def _sliding_window_estimate(previous: int, current: int, elapsed: float, window: int) -> float:
+    """Sliding-window-counter estimate: weight the previous window by how much of it still overlaps."""
+    return previous * (1 - elapsed / window) + current
+
+
+class RateLimiterBackend:
+    """Interface for rate limit state stores."""
+
+    # True when hit() does network I/O and must not run on the event loop
+    blocking = False
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a request for `key` and report whether it is within `limit` per `window` seconds."""
+        raise NotImplementedError
+
+    def release(self, key: str, window: int) -> None:
+        """Give back an allowed hit on `key` (the request was rejected by another rule)."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimiter(RateLimiterBackend):
+    """
+    In-process sliding-window counter: three numbers per key, O(1) per hit.
+    Keys idle for longer than two windows are evicted, and at most `max_keys` are kept.
+    State is per process, so limits are enforced per worker.
+    """
+
+    def __init__(self, max_keys: int = 100000, evictions_per_hit: int = 8, clock=time.time):
+        self.max_keys = max_keys
+        self.evictions_per_hit = evictions_per_hit
+        self.clock = clock
+        # key -> [window index, current count, previous count, window, last seen]
+        self._state: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = self.clock()
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = [window_index, 0, 0, window, now]
+                self._state[key] = state
+            elif state[0] != window_index:
+                # Roll the window: the old current becomes previous only if it was the adjacent window
+                state[2] = state[1] if state[0] == window_index - 1 else 0
+                state[1] = 0
+                state[0] = window_index
+            state[4] = now
+            self._state.move_to_end(key)
+
+            estimate = _sliding_window_estimate(state[2], state[1], elapsed, window)
+            allowed = estimate < limit
+            if allowed:
+                state[1] += 1
+                estimate += 1
+            self._evict_idle(now)
+
+        remaining = max(0, limit - math.ceil(estimate))
+        return RateLimitResult(allowed, limit, remaining, math.ceil(window - elapsed))
+
+    def release(self, key: str, window: int) -> None:
+        window_index = int(self.clock() // window)
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None and state[0] == window_index and state[1] > 0:
+                state[1] -= 1
+
+    def _evict_idle(self, now: float) -> None:
+        # Least recently used keys sit at the front; check only a few per hit to stay O(1)
+        for _ in range(self.evictions_per_hit):
+            if not self._state:
+                return
+            key, state = next(iter(self._state.items()))
+            if len(self._state) > self.max_keys or now - state[4] > 2 * state[3]:
+                del self._state[key]
+            else:
+                return
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class RedisRateLimiter(RateLimiterBackend):
+    """
+    Sliding-window counter shared by every worker through Redis.
+    Each key uses two counters (current and previous window) that expire on their own.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "ratelimit", clock=time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisRateLimiter":
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = self.clock()
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+        current_key = f"{self.prefix}:{key}:{window}:{window_index}"
+        previous_key = f"{self.prefix}:{key}:{window}:{window_index - 1}"
+
+        pipe = self.client.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, 2 * window)
+        pipe.get(previous_key)
+        current, _, previous = pipe.execute()
+
+        estimate = _sliding_window_estimate(int(previous or 0), int(current), elapsed, window)
+        allowed = estimate <= limit
+        if not allowed:
+            # Rejected requests do not consume quota
+            self.client.decr(current_key)
+            estimate -= 1
+
+        remaining = max(0, limit - math.ceil(estimate))
+        return RateLimitResult(allowed, limit, remaining, math.ceil(window - elapsed))
+
+    def release(self, key: str, window: int) -> None:
+        window_index = int(self.clock() // window)
+        self.client.decr(f"{self.prefix}:{key}:{window}:{window_index}")
+
+
+class RateLimiter:
+    """
+    Applies the default per-IP rule plus optional per-route and per-organization rules
+    against a backend. A request is rejected if any applicable rule rejects it, and then
+    charges none of them; the reported result is the most restrictive one.
+    """
+
+    def __init__(
+            self,
+            backend: RateLimiterBackend,
+            default_rule: RateLimitRule,
+            route_rules: Optional[Dict[str, RateLimitRule]] = None,
+            organization_rules: Optional[Dict[str, RateLimitRule]] = None,
+    ):
+        self.backend = backend
+        self.default_rule = default_rule
+        self.route_rules = route_rules or {}
+        self.organization_rules = organization_rules or {}
+
+    def applicable_rules(self, client_ip: str, path: str, organization_id: Optional[str]) -> List[Tuple[str, RateLimitRule]]:
+        rules = [(f"ip:{client_ip}", self.default_rule)]
+        route_rule = self.route_rules.get(path)
+        if route_rule:
+            rules.append((f"route:{path}:ip:{client_ip}", route_rule))
+        if organization_id is not None:
+            organization_rule = self.organization_rules.get(str(organization_id)) or self.organization_rules.get("*")
+            if organization_rule:
+                rules.append((f"org:{organization_id}", organization_rule))
+        return rules
+
+    @property
+    def blocking(self) -> bool:
+        return self.backend.blocking
+
+    def check(self, client_ip: str, path: str, organization_id: Optional[str] = None) -> RateLimitResult:
+        rules = self.applicable_rules(client_ip, path, organization_id)
+        results = [self.backend.hit(key, rule.limit, rule.window) for key, rule in rules]
+        rejected = [result for result in results if not result.allowed]
+        if rejected:
+            # Rejected requests do not consume quota: undo the hits the other rules allowed
+            for (key, rule), result in zip(rules, results):
+                if result.allowed:
+                    self.backend.release(key, rule.window)
+            return max(rejected, key=lambda result: result.reset_after)
+        return min(results, key=lambda result: result.remaining)
+
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    """Standard RateLimit-* response headers (plus Retry-After when rejected)."""
+    headers = {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(result.reset_after),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(result.reset_after)
+    return headers
@@ -0,0 +1,142 @@
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.sql_utils import explain_prefix
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SQL_PROFILE_SAMPLE_RATE = float(os.getenv("SQL_PROFILE_SAMPLE_RATE", 0.0))  # fraction of requests profiled
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", 500))  # log profiled requests slower than this
+# EXPLAIN ANALYZE re-executes the statement; opt in only where the extra load is acceptable
+SQL_SLOW_EXPLAIN_ANALYZE = os.getenv("SQL_SLOW_EXPLAIN_ANALYZE", "false").lower() in ("1", "true", "yes")
+# Bound parameters can hold personal data (emails, salaries); only log them when debugging
+SQL_PROFILE_LOG_PARAMETERS = os.getenv("SQL_PROFILE_LOG_PARAMETERS", "false").lower() in ("1", "true", "yes")
+SQL_SLOW_EXPLAIN_LIMIT = int(os.getenv("SQL_SLOW_EXPLAIN_LIMIT", 3))  # slowest SELECTs explained per request
+SQL_PROFILE_MAX_QUERIES = int(os.getenv("SQL_PROFILE_MAX_QUERIES", 200))  # queries kept per request
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+
+class RequestProfile:
+    """SQL statements executed while handling one request, with their timings."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.queries: List[Dict] = []
+        self.query_count = 0
+        self.db_seconds = 0.0
+
+    def record(self, statement: str, parameters, seconds: float, rowcount: int) -> None:
+        if self.finished is not None:
+            # e.g. a background task still querying after the request completed
+            return
+        self.query_count += 1
+        self.db_seconds += seconds
+        if len(self.queries) < SQL_PROFILE_MAX_QUERIES:
+            self.queries.append({
+                "statement": statement,
+                "parameters": parameters,
+                "duration_ms": round(seconds * 1000, 3),
+                "rowcount": rowcount,
+            })
+
+    def finish(self) -> None:
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    @property
+    def total_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value splitting the request into database and application time."""
+        total_ms = self.total_seconds * 1000
+        db_ms = self.db_seconds * 1000
+        return (f'db;dur={db_ms:.2f};desc="{self.query_count} queries", '
+                f'app;dur={max(total_ms - db_ms, 0):.2f}, total;dur={total_ms:.2f}')
+
+
+def should_profile() -> bool:
+    return SQL_PROFILE_SAMPLE_RATE > 0 and random.random() < SQL_PROFILE_SAMPLE_RATE
+
+
+def start_profile(method: str, path: str):
+    """Begin profiling the current request; returns the token for end_profile()."""
+    profile = RequestProfile(method, path)
+    return profile, _current_profile.set(profile)
+
+
+def end_profile(token) -> None:
+    _current_profile.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    stack = conn.info.get("profile_started")
+    if not stack:
+        return
+    seconds = time.perf_counter() - stack.pop()
+    profile.record(statement, parameters, seconds, getattr(cursor, "rowcount", -1))
+
+
+def install_sql_profiler(engine: Engine) -> None:
+    """Attach the profiling listeners to an engine; they are no-ops outside profiled requests."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def explain_query(engine: Engine, statement: str, parameters, analyze: bool = SQL_SLOW_EXPLAIN_ANALYZE) -> str:
+    """Plan of a recorded statement, run on a fresh connection that is always rolled back."""
+    prefix = explain_prefix(engine.dialect.name, analyze=analyze, format_json=False)
+    with engine.connect() as conn:
+        try:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        finally:
+            conn.rollback()
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+
+def log_slow_request(profile: RequestProfile, explain_engine: Engine) -> None:
+    """
+    Log a profiled request that exceeded SQL_SLOW_REQUEST_MS, with plans of its slowest
+    SELECTs. Plans come from `explain_engine`, a sync engine on the same database (queries
+    made through the async engine cannot be explained from a worker thread).
+    """
+    lines = [
+        f"Slow request {profile.method} {profile.path}: {profile.total_seconds * 1000:.1f} ms, "
+        f"{profile.query_count} queries, {profile.db_seconds * 1000:.1f} ms in the database"
+    ]
+    for query in profile.queries:
+        parameters = str(query["parameters"])[:200] if SQL_PROFILE_LOG_PARAMETERS else "<redacted>"
+        lines.append(f"  {query['duration_ms']:>9.3f} ms  rows={query['rowcount']}  {query['statement']}  "
+                     f"params={parameters}")
+
+    selects = [q for q in profile.queries if q["statement"].lstrip().upper().startswith("SELECT")]
+    for query in sorted(selects, key=lambda q: q["duration_ms"], reverse=True)[:SQL_SLOW_EXPLAIN_LIMIT]:
+        try:
+            plan = explain_query(explain_engine, query["statement"], query["parameters"])
+        except Exception as e:
+            plan = f"(EXPLAIN failed: {e})"
+        lines.append(f"  Plan for {query['duration_ms']:.3f} ms query:\n{plan}")
+    logger.warning("\n".join(lines))
@@ -0,0 +1,34 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+def explain_prefix(dialect_name: str, analyze: bool = False, format_json: bool = True) -> str:
+    """The EXPLAIN keyword(s) to put in front of a SELECT for the given dialect."""
+    if dialect_name != "postgresql":
+        # SQLite and others: EXPLAIN QUERY PLAN reports index usage per table
+        return "EXPLAIN QUERY PLAN "
+    options = []
+    if analyze:
+        options.append("ANALYZE")
+    if format_json:
+        options.append("FORMAT JSON")
+    return f"EXPLAIN ({', '.join(options)}) " if options else "EXPLAIN "
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN wrapper for any SELECT statement, compiled with the statement's own
+    bind parameters so values never have to be rendered inline.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement, analyze: bool = False, format_json: bool = True):
+        self.statement = statement
+        self.analyze = analyze
+        self.format_json = format_json
+
+
+@compiles(Explain)
+def _explain(element, compiler, **kw):
+    prefix = explain_prefix(compiler.dialect.name, element.analyze, element.format_json)
+    return prefix + compiler.process(element.statement, **kw)
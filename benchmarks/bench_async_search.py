@@ -0,0 +1,44 @@
+"""
+Compare requests/sec of the sync (threadpool) and async (DB_ASYNC) search stacks.
+
+    python benchmarks/bench_async_search.py --concurrency 50 200 500 --requests 5000
+
+Uses DATABASE_URL from the environment (seed it first, e.g. with `python app/seed_data.py`).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harness import drive_load, running_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--organization-id", type=int, default=1)
+    args = parser.parse_args()
+
+    path = f"/api/employees/search?organization_id={args.organization_id}&limit=20"
+    results = {}
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        with running_server({"DB_ASYNC": flag}) as base_url:
+            # Warm up connections and caches
+            asyncio.run(drive_load(base_url, lambda i: path, 10, 200))
+            results[mode] = [
+                asyncio.run(drive_load(base_url, lambda i: path, concurrency, args.requests))
+                for concurrency in args.concurrency
+            ]
+
+    print(f"{'concurrency':>12} {'sync rps':>10} {'async rps':>10} {'gain':>8}")
+    for sync_run, async_run in zip(results["sync"], results["async"]):
+        gain = async_run["rps"] / sync_run["rps"] if sync_run["rps"] else 0
+        print(f"{sync_run['concurrency']:>12} {sync_run['rps']:>10} {async_run['rps']:>10} {gain:>7.2f}x")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-benchmark of rate limiting middleware overhead per request.
+
+Drives a minimal app in-process (no sockets) with thousands of concurrent requests
+and compares: no middleware, the previous BaseHTTPMiddleware-style limiter, and the
+pure ASGI RateLimitMiddleware.
+
+    python benchmarks/bench_middleware.py --concurrency 2000 --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.middleware import RateLimitMiddleware  # noqa: E402
+from app.utils.rate_limiter import InMemoryRateLimiter, RateLimiter, RateLimitRule, rate_limit_headers  # noqa: E402
+
+
+class BaseHTTPRateLimitMiddleware(BaseHTTPMiddleware):
+    """Same limiter behind BaseHTTPMiddleware, as the middleware was implemented before."""
+
+    def __init__(self, app, limiter: RateLimiter):
+        super().__init__(app)
+        self.limiter = limiter
+
+    async def dispatch(self, request: Request, call_next):
+        result = self.limiter.check(request.client.host, request.url.path, request.query_params.get("organization_id"))
+        headers = rate_limit_headers(result)
+        if not result.allowed:
+            return JSONResponse(status_code=429, content={"status": 429}, headers=headers)
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status_code": 200, "message": "Server is up and Running!"}
+
+    if middleware:
+        limiter = RateLimiter(InMemoryRateLimiter(), RateLimitRule("ip", 10 ** 12, 60))
+        app.add_middleware(middleware, limiter=limiter)
+    return app
+
+
+async def run(app, concurrency: int, total: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    counter = iter(range(total))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for _ in counter:
+                started = time.perf_counter()
+                response = await client.get("/health?organization_id=1")
+                assert response.status_code == 200
+                latencies.append((time.perf_counter() - started) * 1e6)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "us_per_request": elapsed / total * 1e6,
+        "median_latency_us": statistics.median(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = [
+        ("no middleware", None),
+        ("BaseHTTPMiddleware", BaseHTTPRateLimitMiddleware),
+        ("pure ASGI", RateLimitMiddleware),
+    ]
+    results = {}
+    for label, middleware in variants:
+        app = build_app(middleware)
+        asyncio.run(run(app, 50, 1000))  # warm-up
+        results[label] = asyncio.run(run(app, args.concurrency, args.requests))
+
+    baseline = results["no middleware"]["us_per_request"]
+    print(f"{'variant':<20} {'req/s':>10} {'us/req':>10} {'overhead us':>12} {'median lat us':>14}")
+    for label, result in results.items():
+        print(f"{label:<20} {result['rps']:>10.0f} {result['us_per_request']:>10.1f} "
+              f"{result['us_per_request'] - baseline:>12.1f} {result['median_latency_us']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Latency/throughput benchmark for /api/employees/search.
+
+    python benchmarks/bench_search.py --organizations 20 --employees 5000 --concurrency 1 16 64
+    python benchmarks/bench_search.py --compare benchmarks/results/<old sha>.json benchmarks/results/<new sha>.json
+
+Builds a synthetic dataset (app/synthetic_data.py) in a temporary SQLite file, or uses
+--database-url as is when given (PostgreSQL: seed it first or pass --seed-data). Boots
+the API and drives each workload at each concurrency level: single filter combinations,
+deep offset pages, cursor pages and a weighted "mixed" workload. Reports p50/p95/p99
+latency and requests/sec, and writes the results to benchmarks/results/<git sha>.json.
+--compare prints the change between two result files and exits non-zero when any
+workload regressed by more than --threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harness import REPO_ROOT, drive_load, running_server  # noqa: E402
+
+sys.path.insert(0, REPO_ROOT)
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+# Filter combinations, weighted by how often the UI issues them
+SCENARIOS = {
+    "org_only": ({}, 30),
+    "department": ({"department": "Engineering"}, 20),
+    "department_location": ({"department": "Sales", "location": "New York"}, 15),
+    "status_position": ({"status": "ACTIVE", "position": "Manager"}, 10),
+    "name": ({"name": "son"}, 15),
+    "all_filters": ({"name": "an", "department": "Engineering", "position": "Engineer",
+                     "location": "Remote", "status": "ACTIVE"}, 10),
+}
+# Page depths used by the mixed workload: (extra query parameters, weight)
+PAGE_DEPTHS = {
+    "first_page": ({"offset": 0}, 70),
+    "offset_200": ({"offset": 200}, 15),
+    "offset_2000": ({"offset": 2000}, 5),
+    "cursor": ({"pagination_mode": "cursor", "sort_by": "hire_date"}, 10),
+}
+
+
+def search_path(organization_id: int, filters: Dict, page: Dict, limit: int = 20) -> str:
+    query = {"organization_id": organization_id, "limit": limit, **filters, **page}
+    return f"/api/employees/search?{urlencode(query)}"
+
+
+def build_workloads(organization_ids: List[int], seed: int) -> Dict[str, Callable[[int], str]]:
+    """Name -> next_path(i) for drive_load; paths are deterministic for a given seed."""
+    def fixed(filters: Dict, page: Dict):
+        return lambda i: search_path(organization_ids[i % len(organization_ids)], filters, page)
+
+    workloads = {name: fixed(filters, PAGE_DEPTHS["first_page"][0]) for name, (filters, _) in SCENARIOS.items()}
+    workloads["deep_offset"] = fixed({}, PAGE_DEPTHS["offset_2000"][0])
+    workloads["cursor"] = fixed({}, PAGE_DEPTHS["cursor"][0])
+
+    rng = random.Random(seed)
+    scenario_names, scenario_weights = zip(*((name, weight) for name, (_, weight) in SCENARIOS.items()))
+    depth_names, depth_weights = zip(*((name, weight) for name, (_, weight) in PAGE_DEPTHS.items()))
+    mixed = [
+        search_path(rng.choice(organization_ids),
+                    SCENARIOS[rng.choices(scenario_names, scenario_weights)[0]][0],
+                    PAGE_DEPTHS[rng.choices(depth_names, depth_weights)[0]][0])
+        for _ in range(10000)
+    ]
+    workloads["mixed"] = lambda i: mixed[i % len(mixed)]
+    return workloads
+
+
+def git_revision() -> Dict:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    return {"sha": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain"))}
+
+
+def prepare_database(args) -> str:
+    """Return the DATABASE_URL to benchmark, generating synthetic data when needed."""
+    from sqlalchemy import create_engine
+    from app.models import Base
+    from app.synthetic_data import load_synthetic_data
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_search.db')}"
+    if args.database_url and not args.seed_data:
+        return url
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    result = load_synthetic_data(engine, args.organizations, args.employees, seed=args.seed)
+    engine.dispose()
+    print(f"Generated {result['employees']} employees in {result['seconds']}s")
+    return url
+
+
+def organization_ids(url: str) -> List[int]:
+    from sqlalchemy import create_engine, text
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        ids = list(conn.execute(text("SELECT id FROM organizations ORDER BY id")).scalars())
+    engine.dispose()
+    return ids
+
+
+def run(args) -> Dict:
+    url = prepare_database(args)
+    workloads = build_workloads(organization_ids(url), args.seed)
+    selected = args.workloads or list(workloads)
+    env = {"DATABASE_URL": url, "SEARCH_CACHE_ENABLED": "true" if args.cache else "false"}
+
+    runs = []
+    with running_server(env, workers=args.workers) as base_url:
+        # Warm up connections, caches and the planner
+        asyncio.run(drive_load(base_url, workloads["mixed"], 8, 200))
+        for name in selected:
+            for concurrency in args.concurrency:
+                result = asyncio.run(drive_load(base_url, workloads[name], concurrency, args.requests))
+                runs.append({"workload": name, **result})
+                print(f"{name:>20} c={concurrency:<4} {result['rps']:>9} rps  p50 {result['p50_ms']:>8} ms  "
+                      f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}")
+
+    return {
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "database": url.split(":", 1)[0],
+        "dataset": {"organizations": args.organizations, "employees_per_organization": args.employees,
+                    "seed": args.seed, "generated": not args.database_url or args.seed_data},
+        "settings": {"workers": args.workers, "requests": args.requests, "cache": args.cache},
+        "runs": runs,
+    }
+
+
+def compare(base_path: str, head_path: str, threshold: float) -> bool:
+    """Print per-run changes between two result files; returns True if nothing regressed."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+    base_runs = {(r["workload"], r["concurrency"]): r for r in base["runs"]}
+
+    print(f"{base['revision']['sha']} -> {head['revision']['sha']}")
+    print(f"{'workload':>20} {'conc':>5} {'rps':>16} {'p95 ms':>18} {'p99 ms':>18}")
+    ok = True
+    for run_result in head["runs"]:
+        old = base_runs.get((run_result["workload"], run_result["concurrency"]))
+        if not old:
+            continue
+
+        def change(metric):
+            return (run_result[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+
+        rps_change, p95_change, p99_change = change("rps"), change("p95_ms"), change("p99_ms")
+        regressed = rps_change < -threshold or p95_change > threshold
+        ok = ok and not regressed
+        print(f"{run_result['workload']:>20} {run_result['concurrency']:>5} "
+              f"{run_result['rps']:>8} ({rps_change:+5.1f}%) {run_result['p95_ms']:>9} ({p95_change:+5.1f}%) "
+              f"{run_result['p99_ms']:>9} ({p99_change:+5.1f}%){'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="benchmark an existing database instead of a generated SQLite file")
+    parser.add_argument("--seed-data", action="store_true", help="generate synthetic data into --database-url")
+    parser.add_argument("--organizations", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=5000, help="employees per organization")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per workload and concurrency level")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--workloads", nargs="+", help="subset of workloads to run (default: all)")
+    parser.add_argument("--cache", action="store_true", help="keep the search response cache enabled")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<git sha>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.threshold) else 1)
+
+    results = run(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{results['revision']['sha']}{'-dirty' if results['revision']['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Per-row cost of turning a page of search rows into the JSON response body.
+
+    python benchmarks/bench_serialization.py --rows 100 --iterations 2000
+
+"before" reproduces the previous path: a serializer converting DateTime values with
+isoformat, FastAPI's jsonable_encoder and the stdlib json encoder (JSONResponse).
+"after" is the current path: the pass-through row serializer and ORJSONResponse, which
+encodes dates, enums and floats natively. Runs in-process; no database needed.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.models import Employee  # noqa: E402
+from app.synthetic_data import generate_employees  # noqa: E402
+from app.utils.model_utils import compile_row_serializer, projected_columns  # noqa: E402
+
+COLUMNS = ("name", "email", "phone", "department", "position", "location", "hire_date", "salary",
+           "status", "created_at")
+
+
+def sample_rows(count: int):
+    """Rows shaped like projected_columns(Employee, COLUMNS, ("id",)) results."""
+    selected = [c.key for c in projected_columns(Employee, COLUMNS, ("id",))]
+    created = datetime.datetime(2024, 1, 1, 9, 30, tzinfo=datetime.timezone.utc)
+    rows = []
+    for i, employee in enumerate(generate_employees(random.Random(7), 1, count)):
+        values = {**employee, "id": i + 1, "created_at": created + datetime.timedelta(minutes=i)}
+        rows.append(tuple(values[name] for name in selected))
+    return rows
+
+
+def legacy_serializer():
+    """The serializer as it was before: isoformat() for DateTime columns, resolved per column set."""
+    selected = [c.key for c in projected_columns(Employee, COLUMNS, ("id",))]
+    positions = {name: index for index, name in enumerate(selected)}
+    datetime_columns = {"created_at"}
+
+    def serialize(row):
+        data = {}
+        for name in COLUMNS:
+            value = row[positions[name]]
+            data[name] = value.isoformat() if name in datetime_columns and value is not None else value
+        return data
+
+    return serialize
+
+
+def render_before(rows):
+    serialize = legacy_serializer()
+    body = {"status": 200, "data": [serialize(row) for row in rows], "pagination": {"total": len(rows)}}
+    return JSONResponse(content=jsonable_encoder(body)).body
+
+
+def render_after(rows):
+    serialize = compile_row_serializer(Employee, COLUMNS, ("id",))
+    body = {"status": 200, "data": [serialize(row) for row in rows], "pagination": {"total": len(rows)}}
+    return ORJSONResponse(content=body).body
+
+
+def measure(render, rows, iterations: int) -> float:
+    """Microseconds per row."""
+    render(rows)  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(rows)
+    return (time.perf_counter() - started) / (iterations * len(rows)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    before = measure(render_before, rows, args.iterations)
+    after = measure(render_after, rows, args.iterations)
+    print(f"{args.rows} rows/page, {args.iterations} pages")
+    print(f"before (jsonable_encoder + json): {before:8.2f} us/row")
+    print(f"after  (orjson, pass-through):    {after:8.2f} us/row")
+    print(f"speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ alembic upgrade head
 
 echo "🌱 Seeding initial data..."
 python app/seed_data.py
+python -m app.services.employee_summary_service --rebuild
 
 echo "🚀 Starting FastAPI server..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
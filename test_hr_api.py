@@ -58,3 +58,497 @@ def test_employee_search_invalid_offset_type(client):
 def test_employee_search_empty_string_params(client):
     response = client.get("/api/employees/search?organization_id=1&name=")
     assert response.status_code == 200  # Should still be accepted and treated as no filter
+
+def test_employee_search_cursor_pagination(client):
+    seen = []
+    params = "organization_id=1&pagination_mode=cursor&sort_by=name&limit=2"
+    response = client.get(f"/api/employees/search?{params}")
+    body = response.json()
+    total = body["pagination"]["total"]
+    seen.extend(emp["name"] for emp in body["data"])
+    while body["pagination"]["next_cursor"]:
+        response = client.get(f"/api/employees/search?{params}&cursor={body['pagination']['next_cursor']}")
+        body = response.json()
+        seen.extend(emp["name"] for emp in body["data"])
+    assert len(seen) == total
+    assert seen == sorted(seen)
+
+def test_employee_search_tampered_cursor(client):
+    response = client.get("/api/employees/search?organization_id=1&cursor=eyJpIjo1fQ.AAAA")
+    assert response.json()["status"] == 400
+
+def test_employee_search_count_strategies(client):
+    exact = client.get("/api/employees/search?organization_id=1").json()["pagination"]
+    assert exact["count_strategy"] == "exact"
+
+    cached = client.get("/api/employees/search?organization_id=1&count_strategy=cached").json()["pagination"]
+    assert cached["count_strategy"] == "cached"
+    assert cached["total"] == exact["total"]
+
+    skipped = client.get("/api/employees/search?organization_id=1&count_strategy=none").json()["pagination"]
+    assert skipped["total"] is None
+
+def test_cached_count_follows_data_version():
+    from app.db import SessionLocal
+    from app.models import Employee
+    from app.schema.employee_search_schema import EmployeeSearchRequest
+    from app.services.data_version_service import bump_data_version
+    from app.services.search_count_service import count_matches, invalidate_organization_counts
+
+    filter_data = EmployeeSearchRequest(organization_id=1, count_strategy="cached")
+    db = SessionLocal()
+    try:
+        query = db.query(Employee.id).filter(Employee.organization_id == 1)
+        total, _ = count_matches(db, query, filter_data)
+        assert count_matches(db, query.filter(Employee.id < 0), filter_data) == (total, "cached")
+
+        # A write elsewhere (e.g. another worker) only bumps the shared version
+        bump_data_version(1, broadcast=False)
+        assert count_matches(db, query.filter(Employee.id < 0), filter_data) == (0, "cached")
+    finally:
+        invalidate_organization_counts(1)
+        db.close()
+
+def test_employee_search_name_relevance(client):
+    response = client.get("/api/employees/search?organization_id=1&name=john")
+    names = [emp["name"] for emp in response.json()["data"]]
+    assert names[0] == "John Doe"
+    assert "Bob Johnson" in names
+
+def test_employee_search_short_name_fallback(client):
+    response = client.get("/api/employees/search?organization_id=1&name=jo")
+    names = [emp["name"] for emp in response.json()["data"]]
+    assert "John Doe" in names
+
+def test_column_config_write_invalidates_cache(client):
+    from app.crud.db_crud_operation import create_model_entry_sync, update_model_entry
+    from app.db import SessionLocal
+    from app.models import OrganizationColumnConfig
+
+    before = client.get("/api/employees/search?organization_id=2").json()["data"]
+    assert before and "email" not in before[0]
+
+    db = SessionLocal()
+    try:
+        config = create_model_entry_sync(db, {
+            "organization_id": 2, "column_name": "email", "display_order": 9, "is_visible": 1
+        }, OrganizationColumnConfig)
+        after = client.get("/api/employees/search?organization_id=2").json()["data"]
+        assert "email" in after[0]
+
+        update_model_entry(db, {"is_visible": 0}, {"id": config.id}, OrganizationColumnConfig)
+        restored = client.get("/api/employees/search?organization_id=2").json()["data"]
+        assert "email" not in restored[0]
+    finally:
+        db.close()
+
+def test_search_log_writer_batches_and_flushes():
+    import json
+    import uuid
+    from app.db import SessionLocal
+    from app.models import SearchLog
+    from app.services.search_log_writer import SearchLogWriter
+
+    marker = json.dumps({"batch": uuid.uuid4().hex})
+    writer = SearchLogWriter(batch_size=3, flush_interval_ms=20)
+    for _ in range(7):
+        assert writer.enqueue({"organization_id": 3, "search_filters": marker, "results_count": 0})
+    writer.stop()
+
+    db = SessionLocal()
+    try:
+        assert db.query(SearchLog).filter_by(search_filters=marker).count() == 7
+        db.query(SearchLog).filter_by(search_filters=marker).delete()
+        db.commit()
+    finally:
+        db.close()
+    assert writer.stats()["flushed"] == 7
+    assert writer.stats()["queue_depth"] == 0
+
+def test_search_log_writer_overflow_policies(tmp_path):
+    from app.services.search_log_writer import SearchLogWriter
+
+    dropping = SearchLogWriter(queue_size=1, overflow_policy="drop")
+    dropping.start = lambda: None  # keep the worker idle so the queue stays full
+    assert dropping.enqueue({"organization_id": 1, "results_count": 0})
+    assert not dropping.enqueue({"organization_id": 1, "results_count": 0})
+    assert dropping.stats()["dropped"] == 1
+
+    spill_path = tmp_path / "spill.jsonl"
+    spilling = SearchLogWriter(queue_size=1, overflow_policy="spill", spill_path=str(spill_path))
+    spilling.start = lambda: None
+    spilling.enqueue({"organization_id": 1, "results_count": 0})
+    spilling.enqueue({"organization_id": 1, "results_count": 1})
+    assert spilling.stats()["spilled"] == 1
+    assert spill_path.read_text().count("\n") == 1
+
+def test_search_cache_hits_and_write_invalidation(client):
+    from app.crud.db_crud_operation import update_model_entry
+    from app.db import SessionLocal
+    from app.models import Employee
+    from app.services.search_cache_service import search_cache_stats
+
+    url = "/api/employees/search?organization_id=1&department=Product"
+    first = client.get(url).json()
+    hits_before = search_cache_stats()["hits"]
+    assert client.get(url).json() == first
+    assert search_cache_stats()["hits"] == hits_before + 1
+
+    db = SessionLocal()
+    try:
+        employee = db.query(Employee).filter_by(email="bob.johnson@techcorp.com").first()
+        update_model_entry(db, {"department": "Engineering"}, {"id": employee.id}, Employee)
+        assert client.get(url).json()["data"] == []
+        update_model_entry(db, {"department": "Product"}, {"id": employee.id}, Employee)
+        assert client.get(url).json()["data"] == first["data"]
+    finally:
+        db.close()
+
+def test_blank_filter_search_does_not_share_cache_entry(client):
+    blank = client.get("/api/employees/search?organization_id=1&department=%20%20").json()
+    plain = client.get("/api/employees/search?organization_id=1").json()
+    assert plain["pagination"]["total"] > 0
+    assert blank == plain
+
+    padded = client.get("/api/employees/search?organization_id=1&department=%20Product").json()
+    assert padded["pagination"]["total"] == 0
+    assert client.get("/api/employees/search?organization_id=1&department=Product").json()["pagination"]["total"] > 0
+
+def test_employee_search_conditional_get(client):
+    from app.crud.db_crud_operation import update_model_entry
+    from app.db import SessionLocal
+    from app.models import Employee
+
+    url = "/api/employees/search?organization_id=3&location=Boston"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert "must-revalidate" in first.headers["Cache-Control"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+    # A padded filter matches different rows, so it must not revalidate against this ETag
+    padded = client.get(url.replace("Boston", "%20Boston"), headers={"If-None-Match": etag})
+    assert padded.status_code == 200 and padded.headers["ETag"] != etag
+
+    db = SessionLocal()
+    try:
+        employee = db.query(Employee).filter_by(email="diana.davis@finance.com").first()
+        update_model_entry(db, {"position": "Senior Financial Analyst"}, {"id": employee.id}, Employee)
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        update_model_entry(db, {"position": "Financial Analyst"}, {"id": employee.id}, Employee)
+    finally:
+        db.close()
+
+
+def test_employee_export_streams_ndjson_csv_and_gzip(client):
+    import csv
+    import io
+    import json
+
+    search = client.get("/api/employees/search?organization_id=1&limit=100").json()
+
+    ndjson = client.get("/api/employees/export?organization_id=1")
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert len(rows) == search["pagination"]["total"]
+    assert set(rows[0]) == set(search["data"][0])
+
+    exported_csv = client.get("/api/employees/export?organization_id=1&format=csv&department=Engineering")
+    records = list(csv.DictReader(io.StringIO(exported_csv.text)))
+    assert records and all(record["department"] == "Engineering" for record in records)
+
+    compressed = client.get("/api/employees/export?organization_id=1&gzip=true", headers={"Accept-Encoding": "identity"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx decodes the body because of Content-Encoding; the raw stream must still be valid gzip
+    assert compressed.text == ndjson.text
+
+
+def test_bulk_ingest_upserts_and_reports_row_errors(client):
+    import json
+    from app.db import SessionLocal
+    from app.models import Employee
+
+    url = "/api/employees/search?organization_id=2&location=Atlantis"
+    assert client.get(url).json()["data"] == []
+
+    rows = [
+        {"organization_id": 2, "email": "bulk.one@example.com", "name": "Bulk One", "department": "Ops",
+         "position": "Clerk", "location": "Atlantis", "hire_date": "2024-01-02"},
+        {"organization_id": 2, "email": "bulk.two@example.com", "name": "Bulk Two", "department": "Ops",
+         "position": "Clerk", "location": "Atlantis", "hire_date": "not-a-date"},
+        {"organization_id": 999, "email": "ghost@example.com", "name": "Ghost", "department": "Ops",
+         "position": "Clerk", "location": "Atlantis", "hire_date": "2024-01-02"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+    report = client.post("/api/employees/bulk", content=body,
+                         headers={"Content-Type": "application/x-ndjson"}).json()["data"]
+    assert (report["received"], report["loaded"], report["failed"]) == (4, 1, 3)
+    assert [error["row"] for error in report["errors"]] == [2, 3, 4]
+    assert "hire_date" in report["errors"][0]["error"]
+    assert report["rows_per_second"] > 0
+    # Bulk writes bump the data version, so the cached empty result is not served
+    assert [e["name"] for e in client.get(url).json()["data"]] == ["Bulk One"]
+
+    csv_body = ("organization_id,email,name,department,position,location,hire_date,salary,status,phone\n"
+                "2,bulk.one@example.com,Bulk One,Ops,Lead,Atlantis,2024-01-02,55000,,\n")
+    report = client.post("/api/employees/bulk?format=csv", content=csv_body).json()["data"]
+    assert (report["loaded"], report["failed"]) == (1, 0)
+
+    db = SessionLocal()
+    try:
+        matches = db.query(Employee).filter_by(organization_id=2, email="bulk.one@example.com").all()
+        assert [(e.position, e.salary) for e in matches] == [("Lead", 55000.0)]
+        assert matches[0].updated_at is not None
+        db.query(Employee).filter_by(email="bulk.one@example.com").delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_metrics_endpoint_exposes_search_instrumentation(client):
+    client.get("/api/employees/search?organization_id=1&department=Engineering")
+    body = client.get("/metrics").text
+
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/employees/search",status="200"}' in body
+    for phase in ("column_config", "count_query", "page_query", "serialization"):
+        assert f'employee_search_phase_seconds_count{{phase="{phase}"}}' in body
+    assert 'cache_lookups_total{cache="column_config"' in body
+    assert "rate_limit_rejections_total" in body
+    assert 'search_log_records{outcome="enqueued"}' in body
+
+
+def test_sql_profiling_server_timing_and_slow_log(client, monkeypatch, caplog):
+    import app.middleware as middleware
+    import app.utils.sql_profiler as sql_profiler
+
+    url = "/api/employees/search?organization_id=2&count_strategy=exact"
+    assert "server-timing" not in client.get(url).headers
+
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(middleware, "SQL_SLOW_REQUEST_MS", 0)
+    with caplog.at_level("WARNING", logger="app.utils.sql_profiler"):
+        response = client.get(url + "&department=Marketing")
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=") and "app;dur=" in timing and "total;dur=" in timing
+    slow_log = caplog.text
+    assert "Slow request GET /api/employees/search" in slow_log
+    assert "Plan for" in slow_log and "EXPLAIN failed" not in slow_log
+    assert "params=<redacted>" in slow_log and "Marketing" not in slow_log
+
+
+def test_search_response_encodes_dates_natively(client):
+    import re
+
+    response = client.get("/api/employees/search?organization_id=3")
+    assert response.headers["content-type"] == "application/json"
+    hire_dates = [employee["hire_date"] for employee in response.json()["data"]]
+    assert hire_dates and all(re.fullmatch(r"\d{4}-\d{2}-\d{2}", value) for value in hire_dates)
+
+
+def test_employee_search_facets(client):
+    url = "/api/employees/search?organization_id=1&facets=status,department"
+    body = client.get(url).json()
+    assert list(body["facets"]) == ["department", "status"]
+    assert sum(item["count"] for item in body["facets"]["department"]) == body["pagination"]["total"]
+    assert {item["value"] for item in body["facets"]["status"]} <= {"ACTIVE", "NOT_STARTED", "TERMINATED"}
+
+    filtered = client.get(url + "&department=Engineering").json()
+    assert [item["value"] for item in filtered["facets"]["department"]] == ["Engineering"]
+    assert "facets" not in client.get("/api/employees/search?organization_id=1").json()
+
+
+def test_employee_summaries_answer_aggregates_and_track_writes(monkeypatch):
+    import app.services.employee_summary_service as summaries
+    from app.crud.db_crud_operation import fetch_model_entries_sync, update_model_entry
+    from app.db import SessionLocal
+    from app.models import Employee, EmployeeSummary, EmployeeSummaryGap
+
+    query = {"filter_data": {"organization_id": 1}, "aggregate_data": {"id": "count", "salary": "sum"},
+             "group_by": ["department"], "order_by": ["department"]}
+
+    def both(db):
+        from_summary = [tuple(row) for row in fetch_model_entries_sync(db, model=Employee, **query)]
+        monkeypatch.setattr(summaries, "EMPLOYEE_SUMMARY_ENABLED", False)
+        from_employees = [tuple(row) for row in fetch_model_entries_sync(db, model=Employee, **query)]
+        monkeypatch.setattr(summaries, "EMPLOYEE_SUMMARY_ENABLED", True)
+        return from_summary, from_employees
+
+    db = SessionLocal()
+    try:
+        summaries.rebuild_employee_summaries(db)
+        assert db.query(EmployeeSummary).count() > 0
+        from_summary, from_employees = both(db)
+        assert from_summary == from_employees
+
+        employee = db.query(Employee).filter_by(organization_id=1).order_by(Employee.id).first()
+        original = {"department": employee.department, "salary": employee.salary}
+        update_model_entry(db, {"department": "Summary Dept", "salary": 12345.0}, {"id": employee.id}, Employee)
+        from_summary, from_employees = both(db)
+        assert from_summary == from_employees
+        assert (1, 12345.0) in from_summary
+
+        # Writes that bypass the CRUD layer drift until a rebuild
+        db.query(Employee).filter_by(id=employee.id).update(original)
+        db.commit()
+        assert both(db)[0] != both(db)[1]
+        summaries.rebuild_employee_summaries(db, [1])
+        from_summary, from_employees = both(db)
+        assert from_summary == from_employees
+
+        # Employees without a status are not summarized; matching queries use employees
+        db.query(Employee).filter_by(id=employee.id).update({"status": None})
+        db.commit()
+        summaries.rebuild_employee_summaries(db, [1])
+        assert db.query(EmployeeSummaryGap).filter_by(organization_id=1).count() == 1
+        assert summaries.answer_from_summary(db, **query) is None
+        from_summary, from_employees = both(db)
+        assert from_summary == from_employees
+        other_department = {**query, "filter_data": {"organization_id": 1, "department": "Summary Dept"}}
+        assert summaries.answer_from_summary(db, **other_department) is not None
+        # CRUD writes keep the gap counts current
+        update_model_entry(db, {"status": EmployeeStatus.ACTIVE}, {"id": employee.id}, Employee)
+        assert db.query(EmployeeSummaryGap).count() == 0
+        assert summaries.answer_from_summary(db, **query) is not None
+
+        # A failed refresh (and immediate repair) flags the organization; the next write rebuilds it
+        def failing(*args):
+            raise RuntimeError("summary write failed")
+        monkeypatch.setattr(summaries, "refresh_summary_group", failing)
+        monkeypatch.setattr(summaries, "rebuild_employee_summaries", failing)
+        update_model_entry(db, {"salary": 999.0}, {"id": employee.id}, Employee)
+        assert 1 in summaries.stale_organizations
+        assert summaries.answer_from_summary(db, **query) is None
+        monkeypatch.undo()
+        update_model_entry(db, {"salary": original["salary"]}, {"id": employee.id}, Employee)
+        assert not summaries.stale_organizations
+        from_summary, from_employees = both(db)
+        assert from_summary == from_employees
+    finally:
+        db.close()
+
+
+def test_employee_search_batch_matches_individual_searches(client):
+    searches = [
+        {"organization_id": 1, "department": "Engineering", "limit": 5},
+        {"organization_id": 1, "location": "New York", "offset": 1, "count_strategy": "none"},
+        {"organization_id": 1, "department": "No Such Department"},
+        {"organization_id": 1, "name": "john", "facets": ["department"]},
+        {"organization_id": 1, "pagination_mode": "cursor", "limit": 2},
+    ]
+    body = client.post("/api/employees/search/batch", json={"searches": searches}).json()
+    assert body["status"] == 200
+    assert len(body["data"]) == len(searches)
+
+    for search, result in zip(searches, body["data"]):
+        params = {key: ",".join(value) if isinstance(value, list) else value for key, value in search.items()}
+        single = client.get("/api/employees/search", params=params).json()
+        assert result["pagination"] == single["pagination"]
+        assert result["data"] == single["data"]
+        assert result.get("facets") == single.get("facets")
+
+    mixed = client.post("/api/employees/search/batch",
+                        json={"searches": [{"organization_id": 1}, {"organization_id": 2}]})
+    assert mixed.status_code == 422
+    assert "same organization_id" in mixed.json()["error"]
+    empty = client.post("/api/employees/search/batch", json={"searches": []})
+    assert empty.status_code == 422
+    invalid = client.post("/api/employees/search/batch", json={"searches": [{"organization_id": 1, "limit": 1000}]})
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["searches", 0, "limit"]
+
+
+def test_pool_idle_pre_ping_warm_up_and_churn_metrics(tmp_path, monkeypatch):
+    from prometheus_client import REGISTRY
+    from sqlalchemy import create_engine
+    from app.db import InstrumentedQueuePool, install_idle_pre_ping, warm_up_pool
+    from app.services.metrics_service import instrument_pool
+
+    pooled = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=3, max_overflow=1)
+    install_idle_pre_ping(pooled, idle_seconds=0)
+    instrument_pool(pooled, "test_pool")
+
+    def churn(name):
+        return REGISTRY.get_sample_value("db_pool_connection_events_total",
+                                         {"pool": "test_pool", "event": name}) or 0
+
+    assert warm_up_pool(pooled, 10) == 3
+    assert pooled.pool.checkedin() == 3 and churn("opened") == 3
+
+    pings = []
+    monkeypatch.setattr(pooled.dialect, "do_ping", lambda connection: pings.append(connection) and False)
+    # The idle connection fails its liveness check and is replaced transparently
+    with pooled.connect() as conn:
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+    assert len(pings) == 1
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"pool": "test_pool"}) >= 1
+    assert churn("invalidated") == 1 and churn("opened") == 4
+    pooled.dispose()
+
+
+ASYNC_STACK_SCRIPT = """
+import json, sys
+from fastapi.testclient import TestClient
+from app.db import DB_ASYNC
+from app.main import app
+
+assert DB_ASYNC
+with TestClient(app) as client:
+    responses = [client.get(url) for url in sys.argv[1:]]
+print(json.dumps([[response.status_code, response.json()] for response in responses]))
+"""
+
+def test_async_search_stack_matches_sync(client):
+    import json
+    import os
+    import subprocess
+    import sys
+
+    # DB_ASYNC picks the search route and session dependency at import, so the async
+    # stack (aiosqlite, get_async_db, employee_search_helper_async) runs in its own process
+    urls = [
+        "/api/employees/search?organization_id=1",
+        "/api/employees/search?organization_id=1&department=Engineering&count_strategy=none",
+        "/api/employees/search?organization_id=1&pagination_mode=cursor&limit=2",
+        "/api/employees/search?organization_id=1&limit=1000",
+        "/api/employees/search?organization_id=1&status=UNKNOWN",
+    ]
+    completed = subprocess.run(
+        [sys.executable, "-c", ASYNC_STACK_SCRIPT, *urls],
+        env={**os.environ, "DB_ASYNC": "true"}, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    async_results = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    sync_results = [[response.status_code, response.json()] for response in map(client.get, urls)]
+    assert async_results == sync_results
+    assert [status for status, _ in async_results] == [200, 200, 200, 422, 422]
+    assert async_results[0][1]["data"]
+
+def test_async_pool_reports_checkout_wait(tmp_path):
+    import asyncio
+    from prometheus_client import REGISTRY
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.db import InstrumentedAsyncQueuePool, install_idle_pre_ping
+    from app.services.metrics_service import instrument_pool
+
+    async_pooled = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async_pool.db'}",
+                                       poolclass=InstrumentedAsyncQueuePool, pool_size=2)
+    install_idle_pre_ping(async_pooled.sync_engine, idle_seconds=0)
+    instrument_pool(async_pooled.sync_engine, "test_async_pool")
+
+    async def query_twice():
+        for _ in range(2):
+            async with async_pooled.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+        await async_pooled.dispose()
+
+    asyncio.run(query_twice())
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"pool": "test_async_pool"}) == 2
+    assert REGISTRY.get_sample_value("db_pool_connection_events_total",
+                                     {"pool": "test_async_pool", "event": "opened"}) == 1
@@ -0,0 +1,176 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware import RateLimitMiddleware
+from app.utils.rate_limiter import (
+    InMemoryRateLimiter,
+    RateLimiter,
+    RateLimitRule,
+    RedisRateLimiter,
+    parse_rule_map,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Just enough of the redis-py client for RedisRateLimiter, shared like a real server."""
+
+    def __init__(self):
+        self.data = {}
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        return True
+
+    def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend_factory(request):
+    clock = FakeClock()
+    if request.param == "memory":
+        return clock, lambda: InMemoryRateLimiter(clock=clock)
+    server = FakeRedis()
+    return clock, lambda: RedisRateLimiter(server, clock=clock)
+
+
+def test_limit_is_enforced_and_recovers(backend_factory):
+    clock, make_backend = backend_factory
+    backend = make_backend()
+    clock.now = 1_000_000.0  # start of a 10s window
+
+    results = [backend.hit("ip:1.2.3.4", 3, 10) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+
+    # Two windows later nothing from the old windows counts any more
+    clock.now += 20
+    assert backend.hit("ip:1.2.3.4", 3, 10).allowed
+
+
+def test_sliding_window_weights_previous_window(backend_factory):
+    clock, make_backend = backend_factory
+    backend = make_backend()
+    clock.now = 1_000_000.0
+    for _ in range(4):
+        assert backend.hit("k", 4, 10).allowed
+
+    # Halfway through the next window half of the previous window's 4 hits still count
+    clock.now += 15
+    assert [backend.hit("k", 4, 10).allowed for _ in range(3)] == [True, True, False]
+
+
+def test_redis_backend_shares_state_across_workers():
+    clock = FakeClock()
+    server = FakeRedis()
+    worker_a = RedisRateLimiter(server, clock=clock)
+    worker_b = RedisRateLimiter(server, clock=clock)
+    assert worker_a.hit("ip:x", 2, 60).allowed
+    assert worker_b.hit("ip:x", 2, 60).allowed
+    assert not worker_a.hit("ip:x", 2, 60).allowed
+
+
+def test_in_memory_backend_evicts_idle_keys():
+    clock = FakeClock()
+    backend = InMemoryRateLimiter(clock=clock)
+    for i in range(100):
+        backend.hit(f"ip:{i}", 10, 10)
+    clock.now += 25
+    for _ in range(20):
+        backend.hit("ip:active", 10, 10)
+    assert len(backend) < 101
+
+    bounded = InMemoryRateLimiter(max_keys=10, clock=clock)
+    for i in range(50):
+        bounded.hit(f"ip:{i}", 10, 10)
+    assert len(bounded) <= 10
+
+
+def test_route_and_organization_rules():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        backend=InMemoryRateLimiter(clock=clock),
+        default_rule=RateLimitRule("ip", 100, 60),
+        route_rules=parse_rule_map('{"/api/employees/search": "2/60"}', "route"),
+        organization_rules=parse_rule_map('{"7": "3/60"}', "organization"),
+    )
+    assert limiter.check("a", "/api/employees/search").allowed
+    assert limiter.check("a", "/api/employees/search").allowed
+    assert not limiter.check("a", "/api/employees/search").allowed
+    assert limiter.check("a", "/health").allowed
+
+    # Organization limit is shared by every client IP
+    assert all(limiter.check(ip, "/other", "7").allowed for ip in ("b", "c", "d"))
+    assert not limiter.check("e", "/other", "7").allowed
+    assert limiter.check("e", "/other", "8").allowed
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "redis"])
+def test_rejected_request_does_not_consume_other_rules(backend_name):
+    clock = FakeClock()
+    backend = InMemoryRateLimiter(clock=clock) if backend_name == "memory" else RedisRateLimiter(FakeRedis(), clock=clock)
+    limiter = RateLimiter(
+        backend=backend,
+        default_rule=RateLimitRule("ip", 3, 60),
+        organization_rules=parse_rule_map('{"7": "1/60"}', "organization"),
+    )
+    assert limiter.check("a", "/other", "7").allowed
+    # Rejected by the organization rule; the per-IP quota stays at 2 remaining
+    assert not any(limiter.check("a", "/other", "7").allowed for _ in range(5))
+    assert [limiter.check("a", "/other", "8").allowed for _ in range(3)] == [True, True, False]
+
+
+def test_middleware_sets_rate_limit_headers():
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    limiter = RateLimiter(InMemoryRateLimiter(), RateLimitRule("ip", 1, 60))
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    client = TestClient(app)
+
+    first = client.get("/ping")
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "1"
+    assert first.headers["RateLimit-Remaining"] == "0"
+
+    second = client.get("/ping")
+    assert second.status_code == 429
+    assert "Retry-After" in second.headers
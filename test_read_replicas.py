@@ -0,0 +1,91 @@
+"""
+Read/write routing of app.db.RoutingSession, with SQLite files standing in for the
+primary and its replicas. Each database holds an organization named after it, so a
+query shows which one answered.
+"""
+import pytest
+from sqlalchemy import select
+
+from app.crud.db_crud_operation import update_model_entry
+from app.db import ReplicaSet, build_session_factory, make_engine
+from app.models import Base, Organization
+
+
+def make_database(tmp_path, name):
+    database = make_engine(f"sqlite:///{tmp_path / name}.db")
+    Base.metadata.create_all(database)
+    with database.begin() as conn:
+        conn.execute(Organization.__table__.insert(), {"id": 1, "name": name})
+    return database
+
+
+def answered_by(db):
+    return db.execute(select(Organization.name).where(Organization.id == 1)).scalar()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    return {name: make_database(tmp_path, name) for name in ("primary", "replica_a", "replica_b")}
+
+
+def test_reads_rotate_over_replicas_and_writes_stick_to_primary(databases):
+    replicas = ReplicaSet([databases["replica_a"], databases["replica_b"]], strategy="round_robin")
+    SessionFactory = build_session_factory(databases["primary"], replicas)
+
+    sessions = [SessionFactory() for _ in range(4)]
+    assert [answered_by(db) for db in sessions] == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+    db = sessions[0]
+    db.add(Organization(name="written"))
+    db.commit()
+    # Read-your-writes: the session reads from the primary after writing
+    assert answered_by(db) == "primary"
+    assert db.query(Organization).filter_by(name="written").count() == 1
+    with databases["replica_a"].connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM organizations WHERE name = 'written'").scalar() == 0
+
+    other = sessions[1]
+    update_model_entry(other, {"description": "updated"}, {"id": 1}, Organization)
+    assert answered_by(other) == "primary"
+    for session in sessions:
+        session.close()
+
+
+def test_unhealthy_replicas_fall_back_to_primary(databases, tmp_path):
+    missing = make_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet([missing, databases["replica_a"]], strategy="least_connections", health_interval=60)
+    SessionFactory = build_session_factory(databases["primary"], replicas)
+
+    assert replicas.healthy() == [databases["replica_a"]]
+    with SessionFactory() as db:
+        assert answered_by(db) == "replica_a"
+
+    replicas.mark_down(databases["replica_a"])
+    with SessionFactory() as db:
+        assert answered_by(db) == "primary"
+
+
+def test_reads_use_primary_within_lag_window_after_a_change(databases, monkeypatch):
+    import app.services.data_version_service as data_version_service
+    from app.services.data_version_service import InMemoryDataVersions, bump_data_version, read_own_writes
+
+    monkeypatch.setattr(data_version_service, "data_versions", InMemoryDataVersions())
+    SessionFactory = build_session_factory(databases["primary"], ReplicaSet([databases["replica_a"]]))
+
+    with SessionFactory() as db:
+        read_own_writes(db, 1)
+        assert answered_by(db) == "replica_a"
+
+    # Another request's write to organization 1: every session reads it from the primary for a while
+    bump_data_version(1, broadcast=False)
+    with SessionFactory() as db:
+        read_own_writes(db, 1)
+        assert answered_by(db) == "primary"
+    with SessionFactory() as db:
+        read_own_writes(db, 2)
+        assert answered_by(db) == "replica_a"
+
+    monkeypatch.setattr(data_version_service, "DB_REPLICA_LAG_WINDOW", 0)
+    with SessionFactory() as db:
+        read_own_writes(db, 1)
+        assert answered_by(db) == "replica_a"
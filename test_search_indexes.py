@@ -0,0 +1,97 @@
+"""
+Plan-regression tests: every filter combination the search schema allows must be
+answered through an index, never a sequential scan of `employees`.
+
+Runs against a throw-away SQLite file by default. Point PLAN_TEST_DATABASE_URL at an
+empty PostgreSQL database to check the PostgreSQL planner instead, and raise
+PLAN_TEST_ROWS to check plans at production-like volumes.
+"""
+import itertools
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Employee, EmployeeStatus
+from app.schema.employee_search_schema import EmployeeSearchRequest
+from app.services.employee_search_service import build_search_filters
+from app.synthetic_data import load_synthetic_data
+from app.utils.sql_utils import Explain
+
+PLAN_TEST_ROWS = int(os.getenv("PLAN_TEST_ROWS", 20000))
+PLAN_TEST_ORGS = int(os.getenv("PLAN_TEST_ORGS", 50))
+
+SAMPLE_FILTERS = {
+    "name": "son",
+    "department": "Engineering",
+    "position": "Manager",
+    "location": "Austin",
+    "status": EmployeeStatus.ACTIVE,
+}
+
+SORT_COLUMNS = ["name", "hire_date"]
+
+
+@pytest.fixture(scope="module")
+def plan_session(tmp_path_factory):
+    url = os.getenv("PLAN_TEST_DATABASE_URL") or f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    load_synthetic_data(engine, PLAN_TEST_ORGS, PLAN_TEST_ROWS // PLAN_TEST_ORGS, seed=42)
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _filter_combinations():
+    fields = list(SAMPLE_FILTERS)
+    for size in range(len(fields) + 1):
+        for combo in itertools.combinations(fields, size):
+            yield combo
+
+
+def _postgresql_seq_scans(plan_node):
+    scans = []
+    relation = plan_node.get("Relation Name", "")
+    # employees itself, or one of its partitions when the table is partitioned
+    if plan_node.get("Node Type") == "Seq Scan" and (relation == "employees" or relation.startswith("employees_p")):
+        scans.append(plan_node)
+    for child in plan_node.get("Plans", []):
+        scans.extend(_postgresql_seq_scans(child))
+    return scans
+
+
+def assert_uses_index(session, statement):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        plan = session.execute(Explain(statement)).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        assert not _postgresql_seq_scans(plan[0]["Plan"]), json.dumps(plan, indent=2)
+    else:
+        details = [row[-1] for row in session.execute(Explain(statement))]
+        employee_steps = [d for d in details if d.split(" ")[1:2] == ["employees"]]
+        assert employee_steps, details
+        assert all(step.startswith("SEARCH employees") for step in employee_steps), details
+
+
+@pytest.mark.parametrize("fields", list(_filter_combinations()), ids=lambda f: "+".join(f) or "no-filters")
+def test_search_filter_combination_uses_index(plan_session, fields):
+    filter_data = EmployeeSearchRequest(organization_id=7, **{f: SAMPLE_FILTERS[f] for f in fields})
+    filters, _ = build_search_filters(plan_session, filter_data)
+    statement = select(Employee).where(*filters)
+    assert_uses_index(plan_session, statement)
+
+
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+def test_cursor_page_uses_index(plan_session, sort_by):
+    filter_data = EmployeeSearchRequest(organization_id=7, pagination_mode="cursor", sort_by=sort_by)
+    filters, _ = build_search_filters(plan_session, filter_data)
+    sort_column = getattr(Employee, sort_by)
+    statement = select(Employee).where(*filters).order_by(sort_column, Employee.id).limit(filter_data.limit + 1)
+    assert_uses_index(plan_session, statement)